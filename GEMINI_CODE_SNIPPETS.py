@@ -18,9 +18,17 @@ KEY PRINCIPLE: AI is an AUGMENTATION LAYER. Your system still controls:
 """
 from services.ai_service import (
     classify_competencies_bloom,
-    generate_test_questions
+    generate_test_questions,
+    stream_test_questions,
+    is_classification_cached
 )
 from core.config import GEMINI_API_KEY
+
+# Arrow tables for the Section 3 downloads (pyarrow is pinned in
+# requirements.txt and is already a Streamlit dependency)
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 """
 
 # ============================================================================
@@ -29,7 +37,13 @@ from core.config import GEMINI_API_KEY
 
 """
 # --- Learning Objectives with AI Assistance ---
-with lesson_tabs[1]:
+def _clear_objectives():
+    st.session_state.lesson_objectives = []
+
+# Fragment: widget clicks inside the editor rerun only this function,
+# not the whole script (Streamlit >= 1.33), so no st.rerun() is needed
+@st.fragment
+def _objectives_editor():
     st.markdown("### Learning Objectives")
 
     # Initialize session state
@@ -57,25 +71,29 @@ with lesson_tabs[1]:
                     "bloom": obj_bloom
                 })
                 st.success("✓ Objective added!")
-                st.rerun()
 
     else:  # AI method
         if st.button("🤖 Get AI Suggestion", key="ai_bloom_suggest"):
             if obj_text:
                 try:
-                    with st.spinner("Analyzing with Gemini..."):
-                        result = classify_competencies_bloom(
-                            competencies=[obj_text],
-                            api_key=GEMINI_API_KEY
-                        )
-                        
-                        item = result["competencies"][0]
-                        st.success(f"✓ Suggested Bloom Level: **{item['bloom_level']}**")
-                        st.caption(f"Why: {item['justification']}")
-                        
-                        # Store AI suggestion in session
-                        st.session_state.ai_suggestion = item["bloom_level"]
-                        
+                    # Cache hits return instantly - only show progress on a miss
+                    bar = None
+                    if not is_classification_cached([obj_text]):
+                        bar = st.progress(0, text="Contacting Gemini...")
+                    result = classify_competencies_bloom(
+                        competencies=[obj_text],
+                        api_key=GEMINI_API_KEY
+                    )
+                    if bar is not None:
+                        bar.empty()
+                    
+                    item = result["competencies"][0]
+                    st.success(f"✓ Suggested Bloom Level: **{item['bloom_level']}**")
+                    st.caption(f"Why: {item['justification']}")
+                    
+                    # Store AI suggestion in session
+                    st.session_state.ai_suggestion = item["bloom_level"]
+                    
                 except Exception as e:
                     st.error(f"AI Error: {str(e)}")
 
@@ -97,14 +115,14 @@ with lesson_tabs[1]:
                         "bloom": bloom_to_use
                     })
                     st.success("✓ Objective added!")
-                    st.rerun()
 
     # Display objectives
     if st.session_state.lesson_objectives:
         st.dataframe(st.session_state.lesson_objectives, use_container_width=True)
-        if st.button("Clear All", key="clear_obj"):
-            st.session_state.lesson_objectives = []
-            st.rerun()
+        st.button("Clear All", key="clear_obj", on_click=_clear_objectives)
+
+with lesson_tabs[1]:
+    _objectives_editor()
 """
 
 # ============================================================================
@@ -113,6 +131,12 @@ with lesson_tabs[1]:
 
 """
 # --- Generate Test Questions (AI-Assisted) ---
+@st.cache_data(show_spinner=False)
+def _index_outcomes(outcomes):
+    '''Map outcome text -> outcome dict, plus the ordered selectbox options.'''
+    outcomes_by_text = {o["outcome"]: o for o in outcomes}
+    return outcomes_by_text, list(outcomes_by_text)
+
 with assess_tabs[4]:
     st.markdown("### Generate Test Questions")
     
@@ -130,10 +154,10 @@ with assess_tabs[4]:
     else:
         outcomes = st.session_state.assessment_outcomes
         
-        # Select outcome
-        outcome_texts = [o["outcome"] for o in outcomes]
+        # Select outcome (dict lookup instead of a linear scan each rerun)
+        outcomes_by_text, outcome_texts = _index_outcomes(outcomes)
         selected_text = st.selectbox("Learning Outcome", outcome_texts)
-        selected_outcome = next(o for o in outcomes if o["outcome"] == selected_text)
+        selected_outcome = outcomes_by_text[selected_text]
         
         # Question parameters
         col1, col2, col3 = st.columns([1, 1, 1])
@@ -155,20 +179,35 @@ with assess_tabs[4]:
 
         if generate:
             try:
-                with st.spinner("🤖 Generating with Gemini..."):
-                    result = generate_test_questions(
-                        competency=selected_outcome["outcome"],
-                        bloom_level=bloom_level,
-                        num_items=num_questions,
-                        api_key=GEMINI_API_KEY,
-                        subject=st.session_state.course_details.get("subject", ""),
-                        context=st.session_state.course_details.get("grade_level", "")
+                # Stream questions into the page as Gemini produces them
+                bar = st.progress(0, text="Contacting Gemini...")
+                placeholder = st.empty()
+                streamed = []
+                for q in stream_test_questions(
+                    competency=selected_outcome["outcome"],
+                    bloom_level=bloom_level,
+                    num_items=num_questions,
+                    api_key=GEMINI_API_KEY,
+                    subject=st.session_state.course_details.get("subject", ""),
+                    context=st.session_state.course_details.get("grade_level", "")
+                ):
+                    streamed.append(q)
+                    bar.progress(
+                        min(1.0, len(streamed) / num_questions),
+                        text=f"Received {len(streamed)} of {num_questions} questions"
                     )
+                    placeholder.markdown(
+                        "\\n\\n".join(f"**Q{i}.** {sq['question']}" for i, sq in enumerate(streamed, 1))
+                    )
+                placeholder.empty()
+                bar.empty()
                 
                 # Store in session
-                st.session_state.current_questions = result["questions"]
+                st.session_state.current_questions = streamed
+                # Columnar copy for downloads (serialized by Arrow's C++ writers)
+                st.session_state.current_questions_tbl = pa.Table.from_pylist(streamed)
                 st.session_state.current_outcome = selected_outcome["outcome"]
-                st.success(f"✓ Generated {len(result['questions'])} questions!")
+                st.success(f"✓ Generated {len(streamed)} questions!")
 
             except Exception as e:
                 st.error(f"❌ Error: {str(e)}")
@@ -179,26 +218,43 @@ with assess_tabs[4]:
             st.markdown("#### Generated Questions")
             
             questions = st.session_state.current_questions
+            
+            # Reveal answers with one widget instead of a checkbox per question
+            revealed = set(st.multiselect(
+                "Reveal answers for",
+                options=list(range(1, len(questions) + 1)),
+                format_func=lambda n: f"Q{n}",
+                key="reveal_answers"
+            ))
+            
+            # Render every question in a single markdown element
+            import html
+            html_parts = []
             for i, q in enumerate(questions, 1):
-                with st.expander(f"Q{i} - {q['difficulty']} | Type: {q['type']}"):
-                    st.write(f"**Question:** {q['question']}")
-                    
-                    # Display choices
-                    st.write("**Choices:**")
-                    for j, choice in enumerate(q['choices']):
-                        st.write(f"  {chr(65+j)}) {choice}")
-                    
-                    # Show/Hide answer
-                    if st.checkbox(f"Show Answer", key=f"show_ans_{i}"):
-                        correct_idx = ord(q['answer']) - ord('A')
-                        st.success(f"✓ Correct Answer: **{q['answer']}) {q['choices'][correct_idx]}")
+                choices_html = "".join(f"<li>{html.escape(c)}</li>" for c in q['choices'])
+                answer_html = ""
+                if i in revealed:
+                    answer_html = (
+                        f"<p>✓ Correct Answer: <b>{q['answer']}) "
+                        f"{html.escape(q['choices'][q['answer_idx']])}</b></p>"
+                    )
+                html_parts.append(
+                    f"<details><summary>Q{i} - {q['difficulty']} | Type: {q['type']}</summary>"
+                    f"<p><b>Question:</b> {html.escape(q['question'])}</p>"
+                    f"<ol type='A'>{choices_html}</ol>{answer_html}</details>"
+                )
+            st.markdown("\\n".join(html_parts), unsafe_allow_html=True)
             
             # Export options
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("📥 Download as JSON"):
-                    import json
-                    json_data = json.dumps(questions, indent=2)
+                    try:
+                        import orjson
+                        json_data = orjson.dumps(questions, option=orjson.OPT_INDENT_2)
+                    except ImportError:
+                        import json
+                        json_data = json.dumps(questions, indent=2)
                     st.download_button(
                         label="Save JSON",
                         data=json_data,
@@ -208,29 +264,24 @@ with assess_tabs[4]:
             
             with col2:
                 if st.button("📥 Download as CSV"):
-                    import csv
-                    import io
-                    csv_buffer = io.StringIO()
-                    writer = csv.DictWriter(
-                        csv_buffer,
-                        fieldnames=["Type", "Question", "Choice A", "Choice B", "Choice C", "Choice D", "Answer", "Difficulty"]
-                    )
-                    writer.writeheader()
-                    for q in questions:
-                        writer.writerow({
-                            "Type": q["type"],
-                            "Question": q["question"],
-                            "Choice A": q["choices"][0],
-                            "Choice B": q["choices"][1],
-                            "Choice C": q["choices"][2],
-                            "Choice D": q["choices"][3],
-                            "Answer": q["answer"],
-                            "Difficulty": q["difficulty"]
-                        })
+                    tbl = st.session_state.current_questions_tbl
+                    csv_tbl = pa.table({
+                        "Type": tbl["type"],
+                        "Question": tbl["question"],
+                        **{
+                            f"Choice {letter}": pc.list_element(tbl["choices"], i)
+                            for i, letter in enumerate("ABCD")
+                        },
+                        "Answer": tbl["answer"],
+                        "Difficulty": tbl["difficulty"]
+                    })
+                    csv_sink = pa.BufferOutputStream()
+                    pa_csv.write_csv(csv_tbl, csv_sink)
+                    csv_bytes = csv_sink.getvalue().to_pybytes()
                     
                     st.download_button(
                         label="Save CSV",
-                        data=csv_buffer.getvalue(),
+                        data=csv_bytes,
                         file_name=f"questions_{st.session_state.current_outcome[:20]}.csv",
                         mime="text/csv"
                     )
@@ -329,15 +380,16 @@ if st.button("Test AI Service"):
 # ============================================================================
 
 """
-# Add caching to avoid repeated Gemini calls:
+# classify_competencies_bloom already caches results in a SQLite store on
+# disk (.gemini_cache/, 7-day expiry, override with GEMINI_CACHE_PATH), so
+# hits survive restarts and are shared across Streamlit workers. A thin
+# wrapper is all the UI needs:
 
-import streamlit as st
 from services.ai_service import classify_competencies_bloom
 from core.config import GEMINI_API_KEY
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
 def cached_classify(competencies_tuple):
-    '''Cache Bloom classification results.'''
+    '''Classify via the persistent Gemini cache.'''
     return classify_competencies_bloom(
         competencies=list(competencies_tuple),
         api_key=GEMINI_API_KEY
@@ -7,7 +7,8 @@ Installation:
     pip install fastapi uvicorn pydantic
 
 Run:
-    uvicorn api_server:app --reload --port 8000
+    python api_server.py --dev      (auto-reload, development)
+    python api_server.py            (production settings; API_WORKERS, API_PORT)
 
 API Documentation:
     http://localhost:8000/docs (Swagger UI)
@@ -22,19 +23,39 @@ Endpoints:
     GET    /api/export/docx            - Export to DOCX
     GET    /api/export/pdf             - Export to PDF
     GET    /api/export/csv             - Export to CSV
+    POST   /api/export/{format}/jobs   - Start background DOCX/PDF export
+    GET    /api/export/status/{id}     - Background export status
+    GET    /api/export/download/{id}   - Download background export
     GET    /health                     - Health check
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, status, Depends, Request, Response, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, validator, Field
-from typing import List, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse, ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import List, Optional, Any, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
+import hashlib
 import logging
-import io
+import os
+import re
+import threading
+import uuid
 
-from services.question_api_service import QuestionAPIService
+# Optional: orjson-backed responses (falls back to the stdlib encoder)
+try:
+    import orjson  # noqa: F401
+    DEFAULT_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+    DEFAULT_RESPONSE_CLASS = JSONResponse
+
+from services.question_api_service import QuestionAPIService, BLOOM_LEVELS, VALID_BLOOM_LEVELS
 from services.tqs_export_service import tqs_export_service
+from services.tqs_service import close_gemini_clients
 
 # ======================================================
 # APP INITIALIZATION
@@ -45,33 +66,55 @@ app = FastAPI(
     description="REST API for managing test questions with AI regeneration",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=DEFAULT_RESPONSE_CLASS
 )
 
 # CORS middleware - adjust origins for production
+# Allowed: React dev server (3000), Streamlit (8501), this API (8000)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",   # React dev server
-        "http://localhost:8501",   # Streamlit
-        "http://localhost:8000",   # This API
-    ],
+    allow_origin_regex=r"^http://localhost:(3000|8501|8000)$",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
-# Initialize service
+# Compress larger JSON/CSV payloads
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Storage backend for the question service
 # TODO: Change to 'database' when database is set up
-question_service = QuestionAPIService(storage_backend='session_state')
+QUESTION_STORAGE_BACKEND = os.environ.get("QUESTION_STORAGE_BACKEND", "session_state")
+
+
+@lru_cache(maxsize=None)
+def _build_service(backend: str) -> QuestionAPIService:
+    """Create (once per backend) the question service for this worker."""
+    return QuestionAPIService(storage_backend=backend)
+
+
+def get_service() -> QuestionAPIService:
+    """
+    FastAPI dependency resolving the question service.
+    
+    Override with app.dependency_overrides[get_service] in tests.
+    """
+    return _build_service(QUESTION_STORAGE_BACKEND)
 
 # Setup logging
+# Log lines use %-style arguments so messages below the active level are never formatted
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
 
+# Validation constants (built once, not per request)
+_BLOOM_ERR = f'bloom_level must be one of: {", ".join(BLOOM_LEVELS)}'
+
 
 # ======================================================
 # PYDANTIC MODELS (Request/Response Schemas)
@@ -91,8 +134,8 @@ class QuestionUpdateRequest(BaseModel):
     )
     choices: Optional[List[str]] = Field(
         None, 
-        min_items=4, 
-        max_items=4,
+        min_length=4, 
+        max_length=4,
         description="Exactly 4 choices for MCQ questions"
     )
     correct_answer: Optional[str] = Field(
@@ -119,22 +162,18 @@ class QuestionUpdateRequest(BaseModel):
         description="Sample answer for Essay/Problem Solving/Drawing questions"
     )
     
-    @validator('bloom_level')
+    @field_validator('bloom_level')
+    @classmethod
     def validate_bloom(cls, v):
         """Validate bloom level is one of the 6 standard levels."""
-        if v is not None:
-            valid_levels = [
-                'Remember', 'Understand', 'Apply', 
-                'Analyze', 'Evaluate', 'Create'
-            ]
-            if v not in valid_levels:
-                raise ValueError(
-                    f'bloom_level must be one of: {", ".join(valid_levels)}'
-                )
+        if v is not None and v not in VALID_BLOOM_LEVELS:
+            raise ValueError(_BLOOM_ERR)
         return v
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra='forbid',
+        validate_assignment=False,
+        json_schema_extra={
             "example": {
                 "question_text": "What is the capital of France?",
                 "choices": ["London", "Paris", "Berlin", "Madrid"],
@@ -143,6 +182,7 @@ class QuestionUpdateRequest(BaseModel):
                 "points": 2.0
             }
         }
+    )
 
 
 class QuestionResponse(BaseModel):
@@ -160,8 +200,10 @@ class QuestionResponse(BaseModel):
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra='ignore',
+        json_schema_extra={
             "example": {
                 "question_number": 1,
                 "type": "MCQ",
@@ -175,10 +217,17 @@ class QuestionResponse(BaseModel):
                 "updated_at": "2026-02-17T10:30:00"
             }
         }
+    )
+
+
+# Public question fields, in response order (used for direct serialization)
+_QUESTION_FIELDS = tuple(QuestionResponse.model_fields)
 
 
 class UpdateResponse(BaseModel):
     """Response model for update operations."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     success: bool
     message: str
     data: Optional[QuestionResponse] = None
@@ -196,31 +245,187 @@ class RegenerateRequest(BaseModel):
 
 class DeleteResponse(BaseModel):
     """Response model for delete operations."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     success: bool
     message: str
 
 
+class ExportJobResponse(BaseModel):
+    """Response model for a background export job."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
+    task_id: str
+    status: str
+    format: str
+    filename: str
+    error: Optional[str] = None
+
+
 class HealthResponse(BaseModel):
     """Response model for health check."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     status: str
     service: str
     version: str
 
 
+# ======================================================
+# EXPORT CONSTANTS
+# ======================================================
+
+_DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+_PDF_MIME = "application/pdf"
+_CSV_MIME = "text/csv; charset=utf-8"
+_CSV_HEADERS = {"Content-Disposition": "attachment; filename=questions_export.csv"}
+
+# Anything outside word characters, dots and dashes becomes "_" (covers spaces)
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w.\-]+')
+
+
+def _export_filename(exam_title: str, exam_term: str, extension: str) -> str:
+    """Build a header-safe download filename like ``Final_Exam_Midterm.pdf``."""
+    return _UNSAFE_FILENAME_CHARS.sub('_', f"{exam_title}_{exam_term}") + extension
+
+
+# ======================================================
+# RESPONSE CACHE (versioned)
+# ======================================================
+# Read/export responses are cached under the current questions version.
+# Every write endpoint bumps the version, which invalidates all entries.
+
+_RESPONSE_CACHE_MAX_ENTRIES = 64
+_response_cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+_questions_version = 0
+
+# Prefetched single-question lookups (index -> question) for the current version
+_QUESTION_PREFETCH_WINDOW = 16
+_question_cache: dict = {}
+
+
+def _bump_questions_version() -> None:
+    """Invalidate cached read/export responses after a write."""
+    global _questions_version
+    with _response_cache_lock:
+        _questions_version += 1
+        _response_cache.clear()
+        _question_cache.clear()
+
+
+def _response_cache_get(key: Tuple) -> Any:
+    """Return the cached value for key under the current version, or None."""
+    with _response_cache_lock:
+        full_key = (_questions_version,) + key
+        value = _response_cache.get(full_key)
+        if value is not None:
+            _response_cache.move_to_end(full_key)
+        return value
+
+
+def _response_cache_set(key: Tuple, value: Any, version: int) -> None:
+    """Store value if no write happened since version was read."""
+    with _response_cache_lock:
+        if version != _questions_version:
+            return
+        _response_cache[(version,) + key] = value
+        while len(_response_cache) > _RESPONSE_CACHE_MAX_ENTRIES:
+            _response_cache.popitem(last=False)
+
+
+# ======================================================
+# BACKGROUND EXPORT JOBS
+# ======================================================
+# Rendered files are kept in memory until evicted by newer jobs.
+
+_EXPORT_JOBS_MAX = 32
+_export_jobs: "OrderedDict[str, dict]" = OrderedDict()
+_export_jobs_lock = threading.Lock()
+
+# format -> (renderer, media type)
+_EXPORT_RENDERERS = {
+    "docx": (tqs_export_service.export_to_docx, _DOCX_MIME),
+    "pdf": (tqs_export_service.export_to_pdf, _PDF_MIME),
+}
+
+
+def _new_export_job(export_format: str, filename: str) -> dict:
+    """Register a pending job, evicting the oldest ones past the limit."""
+    job = {
+        "task_id": uuid.uuid4().hex,
+        "status": "pending",
+        "format": export_format,
+        "filename": filename,
+        "content": None,
+        "error": None,
+    }
+    with _export_jobs_lock:
+        _export_jobs[job["task_id"]] = job
+        while len(_export_jobs) > _EXPORT_JOBS_MAX:
+            _export_jobs.popitem(last=False)
+    return job
+
+
+def _run_export_job(job: dict, cache_key: Tuple, version: int, questions: List[dict], **options) -> None:
+    """Render an export in the background (runs in the threadpool)."""
+    renderer, _ = _EXPORT_RENDERERS[job["format"]]
+    job["status"] = "running"
+    try:
+        content = renderer(questions=questions, **options).getvalue()
+    except Exception as e:
+        logger.error("Export job %s failed: %s", job["task_id"], e)
+        job["error"] = str(e)
+        job["status"] = "failed"
+        return
+    _response_cache_set(cache_key, content, version)
+    job["content"] = content
+    job["status"] = "done"
+
+
+def _get_export_job(task_id: str) -> dict:
+    """Look up an export job or raise 404."""
+    with _export_jobs_lock:
+        job = _export_jobs.get(task_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Export job {task_id} not found"
+        )
+    return job
+
+
 # ======================================================
 # API ROUTES
 # ======================================================
 
+def _questions_etag(questions: List[dict]) -> str:
+    """Weak ETag over question order, identity and last modification."""
+    versions = [
+        (q.get('question_number'), q.get('updated_at'), q.get('question_text'))
+        for q in questions
+    ]
+    digest = hashlib.blake2b(repr(versions).encode('utf-8'), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
 @app.get(
     "/api/questions", 
-    response_model=List[QuestionResponse],
+    response_model=None,
+    responses={200: {"model": List[QuestionResponse]}},
     summary="Get all questions",
     description="Retrieve all questions in the system"
 )
-async def get_all_questions():
+async def get_all_questions(
+    request: Request,
+    svc: QuestionAPIService = Depends(get_service)
+):
     """
     Retrieve all questions.
     
+    Supports conditional GET: the response carries a weak ETag, and a
+    matching If-None-Match header returns 304 Not Modified with no body.
+    
     Returns:
         List of all questions with full details
     
@@ -228,11 +433,27 @@ async def get_all_questions():
         GET /api/questions
     """
     try:
-        questions = question_service.get_all_questions(None)
-        logger.info(f"Retrieved {len(questions)} questions")
-        return questions
+        # ETag and serialized body are built once per questions version
+        version = _questions_version
+        cached = _response_cache_get(("questions",))
+        if cached is None:
+            questions = svc.get_all_questions(None)
+            # Serialize directly (orjson when available) instead of re-validating
+            # every stored question through QuestionResponse
+            body = DEFAULT_RESPONSE_CLASS(
+                content=[{field: q.get(field) for field in _QUESTION_FIELDS} for q in questions]
+            ).body
+            cached = (_questions_etag(questions), body, len(questions))
+            _response_cache_set(("questions",), cached, version)
+        etag, body, count = cached
+        
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        
+        logger.info("Retrieved %d questions", count)
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
-        logger.error(f"Error retrieving questions: {str(e)}")
+        logger.error("Error retrieving questions: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving questions: {str(e)}"
@@ -245,7 +466,10 @@ async def get_all_questions():
     summary="Get single question",
     description="Retrieve a specific question by its index"
 )
-async def get_question(question_index: int):
+async def get_question(
+    question_index: int,
+    svc: QuestionAPIService = Depends(get_service)
+):
     """
     Retrieve a single question by index.
     
@@ -261,16 +485,30 @@ async def get_question(question_index: int):
     Example:
         GET /api/questions/0
     """
-    question = question_service.get_question_by_index(question_index, None)
+    with _response_cache_lock:
+        version = _questions_version
+        question = _question_cache.get(question_index)
+    
+    if question is None and question_index >= 0:
+        # Editors walk questions sequentially: fetch the next window in one call.
+        # Out-of-range indexes are dropped from the tail, so zip stays aligned.
+        window = range(question_index, question_index + _QUESTION_PREFETCH_WINDOW)
+        prefetched = svc.get_questions_bulk(None, list(window))
+        with _response_cache_lock:
+            # Skip the store if a write bumped the version while we were reading
+            if version == _questions_version:
+                for i, q in zip(window, prefetched):
+                    _question_cache[i] = q
+        question = prefetched[0] if prefetched else None
     
     if not question:
-        logger.warning(f"Question at index {question_index} not found")
+        logger.warning("Question at index %d not found", question_index)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Question at index {question_index} not found"
         )
     
-    logger.info(f"Retrieved question at index {question_index}")
+    logger.info("Retrieved question at index %d", question_index)
     return question
 
 
@@ -280,7 +518,11 @@ async def get_question(question_index: int):
     summary="Update question",
     description="Update a question with full validation. Only include fields you want to change."
 )
-async def update_question(question_index: int, data: QuestionUpdateRequest):
+async def update_question(
+    question_index: int,
+    data: QuestionUpdateRequest,
+    svc: QuestionAPIService = Depends(get_service)
+):
     """
     Update a question with comprehensive validation.
     
@@ -342,13 +584,13 @@ async def update_question(question_index: int, data: QuestionUpdateRequest):
         400: Validation error or update failed
         404: Question not found at the given index
     """
-    logger.info(f"Updating question at index {question_index}")
+    logger.info("Updating question at index %d", question_index)
     
     # Convert Pydantic model to dict, excluding None values
-    update_data = data.dict(exclude_none=True)
+    update_data = data.model_dump(exclude_none=True)
     
     # Call validated update
-    result = question_service.update_question_validated(
+    result = svc.update_question_validated(
         question_index, 
         update_data, 
         None  # TODO: Replace with database session
@@ -356,7 +598,7 @@ async def update_question(question_index: int, data: QuestionUpdateRequest):
     
     if not result['success']:
         logger.warning(
-            f"Update failed for question {question_index}: {result['errors']}"
+            "Update failed for question %d: %s", question_index, result['errors']
         )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -366,7 +608,8 @@ async def update_question(question_index: int, data: QuestionUpdateRequest):
             }
         )
     
-    logger.info(f"Successfully updated question at index {question_index}")
+    _bump_questions_version()
+    logger.info("Successfully updated question at index %d", question_index)
     return result
 
 
@@ -376,7 +619,10 @@ async def update_question(question_index: int, data: QuestionUpdateRequest):
     summary="Delete question",
     description="Delete a question and automatically renumber remaining questions"
 )
-async def delete_question(question_index: int):
+async def delete_question(
+    question_index: int,
+    svc: QuestionAPIService = Depends(get_service)
+):
     """
     Delete a question and renumber remaining questions.
     
@@ -403,18 +649,19 @@ async def delete_question(question_index: int):
             "message": "Question at index 2 deleted successfully"
         }
     """
-    logger.info(f"Attempting to delete question at index {question_index}")
+    logger.info("Attempting to delete question at index %d", question_index)
     
-    success = question_service.delete_question(question_index, None)
+    success = svc.delete_question(question_index, None)
     
     if not success:
-        logger.warning(f"Failed to delete question at index {question_index}")
+        logger.warning("Failed to delete question at index %d", question_index)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Question at index {question_index} not found or could not be deleted"
         )
     
-    logger.info(f"Successfully deleted question at index {question_index}")
+    _bump_questions_version()
+    logger.info("Successfully deleted question at index %d", question_index)
     return {
         "success": True,
         "message": f"Question at index {question_index} deleted successfully"
@@ -427,7 +674,11 @@ async def delete_question(question_index: int):
     summary="Regenerate question with AI",
     description="Use Gemini API to regenerate a question while keeping same metadata"
 )
-async def regenerate_question(question_index: int, request: RegenerateRequest):
+async def regenerate_question(
+    question_index: int,
+    request: RegenerateRequest,
+    svc: QuestionAPIService = Depends(get_service)
+):
     """
     Regenerate a question using AI (Gemini API).
     
@@ -470,16 +721,16 @@ async def regenerate_question(question_index: int, request: RegenerateRequest):
             ...
         }
     """
-    logger.info(f"Regenerating question at index {question_index}")
+    logger.info("Regenerating question at index %d", question_index)
     
-    success = question_service.regenerate_question(
+    new_question = svc.regenerate_question(
         question_index, 
         request.api_key, 
         None  # TODO: Replace with database session
     )
     
-    if not success:
-        logger.error(f"Failed to regenerate question at index {question_index}")
+    if not new_question:
+        logger.error("Failed to regenerate question at index %d", question_index)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=(
@@ -488,10 +739,9 @@ async def regenerate_question(question_index: int, request: RegenerateRequest):
             )
         )
     
-    # Get the regenerated question
-    new_question = question_service.get_question_by_index(question_index, None)
+    _bump_questions_version()
     
-    logger.info(f"Successfully regenerated question at index {question_index}")
+    logger.info("Successfully regenerated question at index %d", question_index)
     return new_question
 
 
@@ -538,7 +788,9 @@ async def export_to_docx(
     course_name: Optional[str] = "Course Name",
     exam_title: Optional[str] = "Test Question Sheet",
     exam_term: Optional[str] = "Midterm",
-    instructor_name: Optional[str] = ""
+    instructor_name: Optional[str] = "",
+    indexes: Optional[List[int]] = Query(None, description="Question indexes to export (default: all)"),
+    svc: QuestionAPIService = Depends(get_service)
 ):
     """
     Export all questions to DOCX format.
@@ -548,6 +800,7 @@ async def export_to_docx(
         - exam_title: Title of the exam
         - exam_term: Exam term (Midterm, Final, etc.)
         - instructor_name: Instructor name
+        - indexes: Optional repeated question indexes (e.g. ?indexes=0&indexes=3)
     
     Returns:
         DOCX file with formatted questions and answer key
@@ -556,38 +809,50 @@ async def export_to_docx(
         GET /api/export/docx?course_name=CS101&exam_title=Midterm%20Exam
     """
     try:
-        # Get all questions
-        questions = question_service.get_all_questions(None)
+        # Serve the rendered file from cache if nothing changed since
+        cache_key = (
+            "docx", course_name, exam_title, exam_term, instructor_name,
+            tuple(indexes) if indexes is not None else None
+        )
+        version = _questions_version
+        docx_bytes = _response_cache_get(cache_key)
         
-        if not questions:
-            raise HTTPException(
-                status_code=404,
-                detail="No questions found to export"
+        if docx_bytes is None:
+            # Get the requested questions in one call
+            questions = svc.get_questions_bulk(None, indexes)
+            
+            if not questions:
+                raise HTTPException(
+                    status_code=404,
+                    detail="No questions found to export"
+                )
+            
+            # Generate DOCX in a worker thread (python-docx is CPU-bound)
+            docx_buffer = await run_in_threadpool(
+                tqs_export_service.export_to_docx,
+                questions=questions,
+                course_name=course_name,
+                exam_title=exam_title,
+                exam_term=exam_term,
+                instructor_name=instructor_name
             )
-        
-        # Generate DOCX
-        docx_buffer = tqs_export_service.export_to_docx(
-            questions=questions,
-            course_name=course_name,
-            exam_title=exam_title,
-            exam_term=exam_term,
-            instructor_name=instructor_name
-        )
+            docx_bytes = docx_buffer.getvalue()
+            _response_cache_set(cache_key, docx_bytes, version)
         
         # Generate filename
-        filename = f"{exam_title.replace(' ', '_')}_{exam_term}.docx"
+        filename = _export_filename(exam_title, exam_term, ".docx")
         
-        # Return file
-        return StreamingResponse(
-            io.BytesIO(docx_buffer.read()),
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        # Return file (sent in one body with Content-Length, no chunked encoding)
+        return Response(
+            content=docx_bytes,
+            media_type=_DOCX_MIME,
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error exporting to DOCX: {str(e)}")
+        logger.error("Error exporting to DOCX: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to export to DOCX: {str(e)}"
@@ -603,7 +868,9 @@ async def export_to_pdf(
     course_name: Optional[str] = "Course Name",
     exam_title: Optional[str] = "Test Question Sheet",
     exam_term: Optional[str] = "Midterm",
-    instructor_name: Optional[str] = ""
+    instructor_name: Optional[str] = "",
+    indexes: Optional[List[int]] = Query(None, description="Question indexes to export (default: all)"),
+    svc: QuestionAPIService = Depends(get_service)
 ):
     """
     Export all questions to PDF format.
@@ -613,6 +880,7 @@ async def export_to_pdf(
         - exam_title: Title of the exam
         - exam_term: Exam term (Midterm, Final, etc.)
         - instructor_name: Instructor name
+        - indexes: Optional repeated question indexes (e.g. ?indexes=0&indexes=3)
     
     Returns:
         PDF file with formatted questions and answer key
@@ -621,38 +889,50 @@ async def export_to_pdf(
         GET /api/export/pdf?course_name=CS101&exam_title=Final%20Exam
     """
     try:
-        # Get all questions
-        questions = question_service.get_all_questions(None)
+        # Serve the rendered file from cache if nothing changed since
+        cache_key = (
+            "pdf", course_name, exam_title, exam_term, instructor_name,
+            tuple(indexes) if indexes is not None else None
+        )
+        version = _questions_version
+        pdf_bytes = _response_cache_get(cache_key)
         
-        if not questions:
-            raise HTTPException(
-                status_code=404,
-                detail="No questions found to export"
+        if pdf_bytes is None:
+            # Get the requested questions in one call
+            questions = svc.get_questions_bulk(None, indexes)
+            
+            if not questions:
+                raise HTTPException(
+                    status_code=404,
+                    detail="No questions found to export"
+                )
+            
+            # Generate PDF in a worker thread (reportlab is CPU-bound)
+            pdf_buffer = await run_in_threadpool(
+                tqs_export_service.export_to_pdf,
+                questions=questions,
+                course_name=course_name,
+                exam_title=exam_title,
+                exam_term=exam_term,
+                instructor_name=instructor_name
             )
-        
-        # Generate PDF
-        pdf_buffer = tqs_export_service.export_to_pdf(
-            questions=questions,
-            course_name=course_name,
-            exam_title=exam_title,
-            exam_term=exam_term,
-            instructor_name=instructor_name
-        )
+            pdf_bytes = pdf_buffer.getvalue()
+            _response_cache_set(cache_key, pdf_bytes, version)
         
         # Generate filename
-        filename = f"{exam_title.replace(' ', '_')}_{exam_term}.pdf"
+        filename = _export_filename(exam_title, exam_term, ".pdf")
         
-        # Return file
-        return StreamingResponse(
-            io.BytesIO(pdf_buffer.read()),
-            media_type="application/pdf",
+        # Return file (sent in one body with Content-Length, no chunked encoding)
+        return Response(
+            content=pdf_bytes,
+            media_type=_PDF_MIME,
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error exporting to PDF: {str(e)}")
+        logger.error("Error exporting to PDF: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to export to PDF: {str(e)}"
@@ -664,7 +944,10 @@ async def export_to_pdf(
     summary="Export questions to CSV",
     description="Download all questions as a CSV file for import into other systems"
 )
-async def export_to_csv():
+async def export_to_csv(
+    indexes: Optional[List[int]] = Query(None, description="Question indexes to export (default: all)"),
+    svc: QuestionAPIService = Depends(get_service)
+):
     """
     Export all questions to CSV format.
     
@@ -673,6 +956,9 @@ async def export_to_csv():
         Option C, Option D, Correct Answer, Answer Key/Sample Answer, 
         Bloom Level, Points, Learning Outcome
     
+    Query Parameters:
+        - indexes: Optional repeated question indexes (e.g. ?indexes=0&indexes=3)
+    
     Returns:
         CSV file with all question data
     
@@ -680,46 +966,165 @@ async def export_to_csv():
         GET /api/export/csv
     """
     try:
-        # Get all questions
-        questions = question_service.get_all_questions(None)
+        questions = svc.iter_questions(None, indexes)
+        first = next(questions, None)
         
-        if not questions:
+        if first is None:
             raise HTTPException(
                 status_code=404,
                 detail="No questions found to export"
             )
         
-        # Generate CSV
-        csv_buffer = tqs_export_service.export_to_csv(questions)
-        
-        # Return file
+        # Stream rows as they are written; memory stays at one row
         return StreamingResponse(
-            io.StringIO(csv_buffer.read()),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=questions_export.csv"}
+            tqs_export_service.iter_csv(chain((first,), questions)),
+            media_type=_CSV_MIME,
+            headers=_CSV_HEADERS
         )
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error exporting to CSV: {str(e)}")
+        logger.error("Error exporting to CSV: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to export to CSV: {str(e)}"
         )
 
 
+@app.post(
+    "/api/export/{export_format}/jobs",
+    response_model=ExportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start a background DOCX/PDF export",
+    description="Render the export off the request path and return a job ID to poll"
+)
+async def start_export_job(
+    export_format: str,
+    background_tasks: BackgroundTasks,
+    course_name: Optional[str] = "Course Name",
+    exam_title: Optional[str] = "Test Question Sheet",
+    exam_term: Optional[str] = "Midterm",
+    instructor_name: Optional[str] = "",
+    indexes: Optional[List[int]] = Query(None, description="Question indexes to export (default: all)"),
+    svc: QuestionAPIService = Depends(get_service)
+):
+    """
+    Queue a DOCX or PDF export.
+    
+    Path Parameters:
+        - export_format: "docx" or "pdf"
+    
+    Query Parameters:
+        Same as GET /api/export/docx and GET /api/export/pdf
+    
+    Returns:
+        ExportJobResponse with the task_id to poll
+    
+    Example:
+        POST /api/export/pdf/jobs?exam_title=Final%20Exam
+        GET /api/export/status/{task_id}
+        GET /api/export/download/{task_id}
+    """
+    if export_format not in _EXPORT_RENDERERS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unsupported export format: {export_format}"
+        )
+    
+    cache_key = (
+        export_format, course_name, exam_title, exam_term, instructor_name,
+        tuple(indexes) if indexes is not None else None
+    )
+    version = _questions_version
+    cached = _response_cache_get(cache_key)
+    questions = svc.get_questions_bulk(None, indexes) if cached is None else None
+    
+    if cached is None and not questions:
+        raise HTTPException(
+            status_code=404,
+            detail="No questions found to export"
+        )
+    
+    job = _new_export_job(
+        export_format,
+        _export_filename(exam_title, exam_term, f".{export_format}")
+    )
+    
+    if cached is not None:
+        # Already rendered for this version: the job is born finished
+        job["content"] = cached
+        job["status"] = "done"
+    else:
+        background_tasks.add_task(
+            _run_export_job, job, cache_key, version, questions,
+            course_name=course_name,
+            exam_title=exam_title,
+            exam_term=exam_term,
+            instructor_name=instructor_name
+        )
+    
+    return ExportJobResponse(**job)
+
+
+@app.get(
+    "/api/export/status/{task_id}",
+    response_model=ExportJobResponse,
+    summary="Get background export status",
+    description="Poll a job started with POST /api/export/{export_format}/jobs"
+)
+async def get_export_status(task_id: str):
+    """
+    Get the status of a background export job.
+    
+    Returns:
+        ExportJobResponse (status is pending, running, done or failed)
+    """
+    return ExportJobResponse(**_get_export_job(task_id))
+
+
+@app.get(
+    "/api/export/download/{task_id}",
+    summary="Download a finished background export",
+    description="Download the file produced by a background export job"
+)
+async def download_export(task_id: str):
+    """
+    Download the rendered file of a finished export job.
+    
+    Returns:
+        DOCX or PDF file; 409 if the job has not finished successfully
+    """
+    job = _get_export_job(task_id)
+    
+    if job["status"] != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job {task_id} is {job['status']}"
+            + (f": {job['error']}" if job["error"] else "")
+        )
+    
+    _, media_type = _EXPORT_RENDERERS[job["format"]]
+    return Response(
+        content=job["content"],
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={job['filename']}"}
+    )
+
+
 # ======================================================
 # ERROR HANDLERS
 # ======================================================
 
 @app.exception_handler(ValueError)
 async def value_error_handler(request, exc):
-    """Handle ValueError exceptions."""
-    logger.error(f"ValueError: {str(exc)}")
-    return HTTPException(
+    """Handle ValueError exceptions as 400 responses."""
+    logger.error("ValueError: %s", exc)
+    # Exception handlers must return a response; returning an HTTPException
+    # is not rendered and ends up as a 500
+    return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
-        detail=str(exc)
+        content={"detail": str(exc)}
     )
 
 
@@ -738,27 +1143,76 @@ async def startup_event():
 async def shutdown_event():
     """Run on API shutdown."""
     logger.info("👋 SmartLesson Question API shutting down...")
+    # Release pooled connections held by the shared Gemini clients
+    close_gemini_clients()
 
 
 # ======================================================
 # MAIN (for running directly)
 # ======================================================
 
-if __name__ == "__main__":
+def dev_main() -> None:
+    """Run a single auto-reloading server for local development."""
     import uvicorn
     
+    uvicorn.run(
+        "api_server:app",
+        host="0.0.0.0",
+        port=8000,
+        log_level="info",
+        reload=True  # Auto-reload on code changes (development only)
+    )
+
+
+def prod_main() -> None:
+    """
+    Run the server with production settings.
+    
+    No reloader, no per-request access log, and uvloop/httptools when they
+    are installed. Questions, caches and export jobs live in process memory,
+    so API_WORKERS defaults to 1; raise it only with a shared storage backend.
+    """
+    import uvicorn
+    
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    
+    uvicorn.run(
+        "api_server:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("API_PORT", "8000")),
+        workers=int(os.environ.get("API_WORKERS", "1")),
+        loop=loop,
+        http=http,
+        log_level="info",
+        access_log=False
+    )
+
+
+if __name__ == "__main__":
+    import sys
+    
+    dev_mode = "--dev" in sys.argv[1:] or os.environ.get("ENV", "").lower() == "dev"
+    
     print("=" * 60)
     print("🚀 Starting SmartLesson Question API Server")
     print("=" * 60)
     print("📍 API URL: http://localhost:8000")
     print("📚 Swagger UI: http://localhost:8000/docs")
     print("📖 ReDoc: http://localhost:8000/redoc")
+    print(f"⚙️  Mode: {'development (auto-reload)' if dev_mode else 'production'}")
     print("=" * 60)
     
-    uvicorn.run(
-        app, 
-        host="0.0.0.0", 
-        port=8000, 
-        log_level="info",
-        reload=True  # Auto-reload on code changes (development only)
-    )
+    if dev_mode:
+        dev_main()
+    else:
+        prod_main()
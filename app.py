@@ -1,7 +1,7 @@
 import streamlit as st
 from services.tos_service import generate_tos
 from services.export_service import export_tos_exact_format
-from services.pdf_service import extract_syllabus_details
+from services.pdf_service import extract_syllabus_details_cached, clear_syllabus_cache
 from services.tqs_export_service import tqs_export_service
 
 from services.question_type_service import (
@@ -29,11 +29,26 @@ from services.question_api_service import QuestionAPIService
 import pandas as pd
 import os
 import json
-import uuid
+import hashlib
+import copy
+import itertools
 import random
+import threading
 import logging
 from typing import Dict, Tuple, Any
 
+# Optional: Gemini classification cache (requires google-genai)
+try:
+    from services.ai_service import clear_classification_cache
+except ImportError:
+    clear_classification_cache = None
+
+# Optional: orjson for faster JSON export (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # ======================================================
@@ -74,7 +89,7 @@ def render_login_page() -> None:
 # ======================================================
 # SECRETS HELPERS
 # ======================================================
-def get_gemini_api_key() -> str | None:
+def _read_gemini_api_key() -> str | None:
     """Safely read GEMINI_API_KEY from Streamlit secrets or environment."""
     try:
         if "GEMINI_API_KEY" in st.secrets:
@@ -85,6 +100,21 @@ def get_gemini_api_key() -> str | None:
 
     return os.environ.get("GEMINI_API_KEY")
 
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _cached_gemini_api_key() -> str:
+    # Raising keeps a missing key out of the cache, so adding it later is picked up
+    api_key = _read_gemini_api_key()
+    if not api_key:
+        raise LookupError("GEMINI_API_KEY is not configured")
+    return api_key
+
+def get_gemini_api_key() -> str | None:
+    """GEMINI_API_KEY from Streamlit secrets or environment, looked up once per hour."""
+    try:
+        return _cached_gemini_api_key()
+    except LookupError:
+        return None
+
 # ======================================================
 # INITIALIZE QUESTION API SERVICE
 # ======================================================
@@ -106,6 +136,10 @@ def regenerate_single_question(question_index: int, api_key: str):
     """Regenerate a single question using Gemini API."""
     return question_api.regenerate_question(question_index, api_key, st.session_state)
 
+def regenerate_selected_questions(question_indexes: list, api_key: str):
+    """Regenerate several questions in batched Gemini calls (grouped by type/Bloom/outcome)."""
+    return question_api.regenerate_questions(question_indexes, api_key, st.session_state)
+
 def calculate_missing_slots(assigned_slots: list, generated_tqs: list) -> list:
     """
     Calculate which slots are missing from the generated TQS.
@@ -127,12 +161,197 @@ def calculate_missing_slots(assigned_slots: list, generated_tqs: list) -> list:
     
     return missing_slots
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def cached_extract_syllabus(pdf_bytes, exam_term="Midterm"):
-    """Cache PDF extraction to avoid repeated processing. Caches per exam_term."""
-    import io
-    pdf_file = io.BytesIO(pdf_bytes)
-    return extract_syllabus_details(pdf_file, exam_term=exam_term)
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)  # Cache for 1 hour; the tab shows its own spinner
+def cached_extract_syllabus(pdf_digest, _pdf_bytes, exam_term="Midterm"):
+    """Cache PDF extraction to avoid repeated processing. Caches per exam_term.
+    
+    Keyed on the content digest only (the leading underscore tells Streamlit not
+    to hash the raw bytes on every rerun). Backed by an on-disk cache keyed by
+    file content, so restarts don't re-parse.
+    """
+    return extract_syllabus_details_cached(_pdf_bytes, exam_term=exam_term)
+
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+def cached_parse_tos_file(file_digest, _file_content, file_name):
+    """parse_tos_file, memoized on the uploaded file's content digest and name.
+    
+    _file_content may be bytes or the uploaded file object itself.
+    """
+    return parse_tos_file(_file_content, file_name)
+
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+def cached_validate_tos(file_digest, file_name, _tos_data):
+    """validate_tos_for_tqs_generation for a parsed upload, memoized like its parse."""
+    return validate_tos_for_tqs_generation(_tos_data)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _build_mixed_slots(outcome_index: tuple, matrix_key: tuple, dist_key: tuple, seed: int) -> tuple:
+    """Pure core of calculate_mixed_distribution_slots, memoized on hashable snapshots.
+    
+    The type-slot shuffle uses its own Random(seed), so equal inputs always give
+    the same assignment. Returns (bloom, outcome_id, outcome_text, type, points) rows.
+    """
+    # All type slots based on distribution, drawn in random order in one pass
+    types_expanded = list(itertools.chain.from_iterable(
+        [(q_type, points)] * items for q_type, items, points in dist_key
+    ))
+    type_slots = random.Random(seed).sample(types_expanded, len(types_expanded))
+    
+    # One (bloom, outcome) entry per item, in Bloom-then-outcome order
+    norm_matrix = [(bloom, dict(counts)) for bloom, counts in matrix_key]
+    flat = [
+        (bloom, outcome_id, outcome_text)
+        for bloom, counts in norm_matrix
+        for outcome_id, outcome_text in outcome_index
+        for _ in range(counts.get(str(outcome_id), 0))
+    ]
+    
+    return tuple(
+        (bloom, outcome_id, outcome_text, q_type, points)
+        for (q_type, points), (bloom, outcome_id, outcome_text) in zip(type_slots, flat)
+    )
+
+def prewarm_syllabus_extraction(pdf_bytes, exam_term):
+    """Fill the on-disk extraction cache for exam_term in a background thread.
+    
+    Only the Streamlit-free disk layer is warmed, so the thread never touches
+    session state; the next cached_extract_syllabus call for that term is a disk hit.
+    """
+    threading.Thread(
+        target=extract_syllabus_details_cached,
+        args=(pdf_bytes,),
+        kwargs={"exam_term": exam_term},
+        daemon=True
+    ).start()
+
+def next_row_id() -> str:
+    """Session-unique id for an editable row (outcomes); a counter is enough here."""
+    if "_row_counter" not in st.session_state:
+        st.session_state._row_counter = itertools.count()
+    return f"r{next(st.session_state._row_counter)}"
+
+def question_types_key(question_types) -> tuple:
+    """Hashable snapshot of the question-type distribution, used as a cache key."""
+    return tuple((qt.id, qt.type, qt.items, qt.points_per_item) for qt in question_types)
+
+def _question_types_from_key(qt_key: tuple) -> list:
+    return [QuestionType(qt_type, items, points, id=qt_id) for qt_id, qt_type, items, points in qt_key]
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def cached_question_type_totals(qt_key: tuple) -> Tuple[int, float]:
+    """compute_question_type_totals, memoized on the distribution snapshot."""
+    return compute_question_type_totals(_question_types_from_key(qt_key))
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def cached_question_types_summary_df(qt_key: tuple) -> pd.DataFrame:
+    """Summary table (with TOTAL row) for the distribution, memoized on its snapshot."""
+    return pd.DataFrame(format_question_types_for_display(_question_types_from_key(qt_key)))
+
+def tos_table_key(outcomes, tos_matrix) -> tuple:
+    """Hashable snapshot of the generated TOS (outcomes + matrix), used as a cache key."""
+    return (
+        tuple((o["id"], o["text"]) for o in outcomes),
+        tuple((bloom, tuple(slots.items())) for bloom, slots in tos_matrix.items()),
+    )
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def cached_tos_table_df(tos_key: tuple) -> pd.DataFrame:
+    """Outcome x Bloom-level table of the TOS, built column-wise and memoized."""
+    outcomes_key, matrix_key = tos_key
+    return pd.DataFrame({
+        "Learning Outcome": [text for _, text in outcomes_key],
+        **{
+            bloom: [slots.get(outcome_id, 0) for outcome_id, _ in outcomes_key]
+            for bloom, slots in ((bloom, dict(items)) for bloom, items in matrix_key)
+        },
+    })
+
+def normalize_tqs_fields(tqs):
+    """Give every question the canonical type/bloom/outcome_text keys, in place.
+    
+    Older records may only carry question_type/bloom_level/learning_outcome;
+    normalizing once at generation lets the preview read the canonical keys directly.
+    """
+    for q in tqs:
+        if "type" not in q:
+            q["type"] = q.get("question_type", "MCQ")
+        if "bloom" not in q:
+            q["bloom"] = q.get("bloom_level", "Remember")
+        if "outcome_text" not in q:
+            q["outcome_text"] = q.get("learning_outcome", "N/A")
+    return tqs
+
+def tqs_json_bytes(tqs) -> bytes:
+    """Indented JSON of the TQS for download, serialized in C when orjson is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(tqs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(tqs, indent=2).encode("utf-8")
+
+def tqs_stats_key(tqs) -> tuple:
+    """Hashable snapshot of the fields get_tqs_statistics reads, used as a cache key."""
+    return tuple(
+        (q.get("type", "Unknown"), q.get("bloom", "Unknown"), q.get("points", 0))
+        for q in tqs
+    )
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def cached_tqs_stats_frames(stats_key: tuple) -> Tuple[Dict[str, Any], pd.DataFrame, pd.DataFrame]:
+    """TQS statistics plus the by-type and by-Bloom breakdown tables, memoized on the snapshot."""
+    stats = get_tqs_statistics(
+        [{"type": qtype, "bloom": bloom, "points": points} for qtype, bloom, points in stats_key]
+    )
+    by_type = sorted(stats["questions_by_type"])
+    df_types = pd.DataFrame({
+        "Type": by_type,
+        "Count": [stats["questions_by_type"][qtype] for qtype in by_type],
+        "Points": [stats["points_by_type"].get(qtype, 0) for qtype in by_type],
+    })
+    by_bloom = sorted(stats["questions_by_bloom"])
+    df_bloom = pd.DataFrame({
+        "Bloom Level": by_bloom,
+        "Count": [stats["questions_by_bloom"][bloom] for bloom in by_bloom],
+        "Points": [stats["points_by_bloom"].get(bloom, 0) for bloom in by_bloom],
+    })
+    return stats, df_types, df_bloom
+
+# ======================================================
+# BLOOM'S TAXONOMY DEFAULT PROFILES (read-only)
+# ======================================================
+BLOOMS = ("Remember", "Understand", "Apply", "Analyze", "Evaluate", "Create")
+QUESTION_TYPES = ("MCQ", "True or False", "Essay", "Short Answer", "Problem Solving")
+
+_BOARD_PROFILE = {
+    "Remember": 30,
+    "Understand": 30,
+    "Apply": 20,
+    "Analyze": 10,
+    "Evaluate": 5,
+    "Create": 5
+}
+_NON_BOARD_PROFILE = {
+    "Remember": 10,
+    "Understand": 15,
+    "Apply": 30,
+    "Analyze": 30,
+    "Evaluate": 10,
+    "Create": 5
+}
+_CUSTOM_PROFILE = {
+    "Remember": 0,
+    "Understand": 0,
+    "Apply": 0,
+    "Analyze": 0,
+    "Evaluate": 0,
+    "Create": 0
+}
+BLOOM_PROFILES = {
+    "Board Course": _BOARD_PROFILE,
+    "Non-Board Course (IT/CS)": _NON_BOARD_PROFILE,
+    "Custom": _CUSTOM_PROFILE,
+}
 
 st.set_page_config(
     page_title="SmartLesson",
@@ -150,6 +369,16 @@ if st.sidebar.button("Logout"):
     st.session_state.login_error = ""
     st.rerun()
 
+with st.sidebar.expander("Debug"):
+    if st.button("Clear syllabus extraction cache"):
+        cached_extract_syllabus.clear()
+        removed = clear_syllabus_cache()
+        st.success(f"Syllabus cache cleared ({removed} stored results)")
+    if clear_classification_cache is not None:
+        if st.button("Clear AI classification cache"):
+            clear_classification_cache()
+            st.success("Classification cache cleared")
+
 st.title("📘 SmartLesson")
 st.caption("Lesson Planning | TOS & Test Question Generator")
 
@@ -200,7 +429,7 @@ with main_tabs[0]:
         obj_text = st.text_input("Objective")
         obj_bloom = st.selectbox(
             "Bloom’s Level",
-            ["Remember", "Understand", "Apply", "Analyze", "Evaluate", "Create"]
+            BLOOMS
         )
 
         if st.button("Add Objective"):
@@ -232,6 +461,8 @@ with main_tabs[0]:
 # TAB 2: ASSESSMENT GENERATOR
 # ======================================================
 with main_tabs[1]:
+    # Local alias: session state is read many times per rerun in these tabs
+    ss = st.session_state
     st.subheader("Assessment Generator")
 
     assess_tabs = st.tabs([
@@ -248,8 +479,8 @@ with main_tabs[1]:
         st.markdown("### Course / Syllabus Information")
 
         # Initialize session state for course details
-        if "course_details" not in st.session_state:
-            st.session_state.course_details = {
+        if "course_details" not in ss:
+            ss.course_details = {
                 "course_code": "",
                 "course_title": "",
                 "semester": "1st",
@@ -265,10 +496,10 @@ with main_tabs[1]:
             "Which exam term do you want to create TOS for?",
             ["Midterm", "Final"],
             horizontal=True,
-            index=["Midterm", "Final"].index(st.session_state.course_details["exam_term"]),
+            index=["Midterm", "Final"].index(ss.course_details["exam_term"]),
             key="exam_term_select_top"
         )
-        st.session_state.course_details["exam_term"] = exam_term
+        ss.course_details["exam_term"] = exam_term
         st.info(f"📌 Learning outcomes will be extracted for: **{exam_term}**")
 
         col1, col2 = st.columns(2)
@@ -282,56 +513,74 @@ with main_tabs[1]:
         )
 
         if syllabus_file is not None:
-            # Read PDF bytes for caching
-            pdf_bytes = syllabus_file.read()
+            # Read PDF bytes and fingerprint them once; the digest is the cache key
+            pdf_bytes = syllabus_file.getvalue()
+            pdf_digest = hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
             
             # Get the selected exam_term
-            selected_exam_term = st.session_state.course_details.get("exam_term", "Midterm")
+            selected_exam_term = ss.course_details.get("exam_term", "Midterm")
             
-            # Check if exam_term has changed - if so, re-extract learning outcomes
-            outcomes_need_refresh = (
-                "extracted_exam_term" not in st.session_state or 
-                st.session_state.extracted_exam_term != selected_exam_term
-            )
+            # Dirty flag: only extract and copy into session state when the file
+            # or the exam term changed since the last successful extraction
+            processed_key = (pdf_digest, selected_exam_term)
+            already_processed = ss.get("pdf_processed_digest") == processed_key
             
-            with st.spinner(f"📖 Extracting syllabus details for {selected_exam_term}... (Optimized)"):
-                # Use cached extraction with exam_term parameter
-                extracted = cached_extract_syllabus(pdf_bytes, exam_term=selected_exam_term)
+            if already_processed:
+                extracted = ss.last_extracted
+            else:
+                with st.spinner(f"📖 Extracting syllabus details for {selected_exam_term}... (Optimized)"):
+                    extracted = cached_extract_syllabus(pdf_digest, pdf_bytes, exam_term=selected_exam_term)
                 
                 if "error" not in extracted:
-                    # Check if already processed (don't reprocess) - BUT DO refresh if exam_term changed
-                    if "pdf_processing_done" not in st.session_state or outcomes_need_refresh:
-                        # Update session state with extracted data - ONLY ONCE (or when exam_term changes)
-                        st.session_state.course_details["course_code"] = extracted.get("course_code", "")
-                        st.session_state.course_details["course_title"] = extracted.get("course_title", "")
-                        st.session_state.course_details["semester"] = extracted.get("semester", "1st") or "1st"
-                        st.session_state.course_details["academic_year"] = extracted.get("academic_year", "2025–2026")
-                        st.session_state.course_details["instructor"] = extracted.get("instructor", "")
-                        
-                        # Store learning outcomes for the next tab
-                        st.session_state.extracted_learning_outcomes = extracted.get("learning_outcomes", [])
-                        st.session_state.extracted_exam_term = selected_exam_term  # NEW: Track which exam_term these outcomes are for
-                        st.session_state.pdf_processing_done = True
+                    # Update session state with extracted data - ONLY when the file or exam_term changes
+                    ss.course_details["course_code"] = extracted.get("course_code", "")
+                    ss.course_details["course_title"] = extracted.get("course_title", "")
+                    ss.course_details["semester"] = extracted.get("semester", "1st") or "1st"
+                    ss.course_details["academic_year"] = extracted.get("academic_year", "2025–2026")
+                    ss.course_details["instructor"] = extracted.get("instructor", "")
                     
-                    st.success("✅ Syllabus details extracted successfully!")
+                    # Store learning outcomes for the next tab
+                    ss.extracted_learning_outcomes = extracted.get("learning_outcomes", [])
+                    ss.extracted_exam_term = selected_exam_term  # NEW: Track which exam_term these outcomes are for
+                    ss.pdf_processing_done = True
                     
-                    # Show extracted information
-                    with st.expander("📋 Extracted Details", expanded=True):
-                        st.write(f"**Course Code:** {extracted.get('course_code', 'Not found')}")
-                        st.write(f"**Course Title:** {extracted.get('course_title', 'Not found')}")
-                        st.write(f"**Semester:** {extracted.get('semester', 'Not found')}")
-                        st.write(f"**Academic Year:** {extracted.get('academic_year', 'Not found')}")
-                        st.write(f"**Instructor:** {extracted.get('instructor', 'Not found')}")
-                        
-                        if extracted.get("learning_outcomes"):
-                            st.write("**Learning Outcomes Found:**")
-                            for idx, outcome in enumerate(extracted.get("learning_outcomes", [])[:15], 1):
-                                st.write(f"{idx}. {outcome}")
-                            st.info(f"✅ Found {len(extracted.get('learning_outcomes', []))} learning outcomes. Go to the **Learning Outcomes** tab to import them!")
-                        else:
-                            st.warning("⚠️ No learning outcomes found in Section IV. Make sure your PDF has a 'Learning Outcomes' section in 'Section IV'.")
-                else:
-                    st.error(f"❌ Error extracting PDF: {extracted.get('error', 'Unknown error')}")
+                    ss.last_extracted = extracted
+                    ss.pdf_processed_digest = processed_key
+                    
+                    # Warm the other exam term in the background so toggling is instant
+                    prewarmed = ss.setdefault("syllabus_prewarmed", set())
+                    if pdf_digest not in prewarmed:
+                        prewarmed.add(pdf_digest)
+                        other_term = "Final" if selected_exam_term == "Midterm" else "Midterm"
+                        prewarm_syllabus_extraction(pdf_bytes, other_term)
+            
+            if "error" not in extracted:
+                st.success("✅ Syllabus details extracted successfully!")
+                
+                # Show extracted information
+                with st.expander("📋 Extracted Details", expanded=True):
+                    # One markdown block instead of a separate element per line
+                    details_md = (
+                        f"**Course Code:** {extracted.get('course_code', 'Not found')}\n\n"
+                        f"**Course Title:** {extracted.get('course_title', 'Not found')}\n\n"
+                        f"**Semester:** {extracted.get('semester', 'Not found')}\n\n"
+                        f"**Academic Year:** {extracted.get('academic_year', 'Not found')}\n\n"
+                        f"**Instructor:** {extracted.get('instructor', 'Not found')}"
+                    )
+                    
+                    if extracted.get("learning_outcomes"):
+                        details_md += "\n\n**Learning Outcomes Found:**\n\n" + "\n".join(
+                            f"{idx}. {outcome}"
+                            for idx, outcome in enumerate(extracted.get("learning_outcomes", [])[:15], 1)
+                        )
+                    st.markdown(details_md)
+                    
+                    if extracted.get("learning_outcomes"):
+                        st.info(f"✅ Found {len(extracted.get('learning_outcomes', []))} learning outcomes. Go to the **Learning Outcomes** tab to import them!")
+                    else:
+                        st.warning("⚠️ No learning outcomes found in Section IV. Make sure your PDF has a 'Learning Outcomes' section in 'Section IV'.")
+            else:
+                st.error(f"❌ Error extracting PDF: {extracted.get('error', 'Unknown error')}")
 
         # Manual Course Details Input
         st.markdown("#### ✏️ Course Details (Manual Entry / Edit)")
@@ -339,48 +588,48 @@ with main_tabs[1]:
         with col1:
             course_code = st.text_input(
                 "Course Code",
-                value=st.session_state.course_details["course_code"],
+                value=ss.course_details["course_code"],
                 key="course_code_input"
             )
-            st.session_state.course_details["course_code"] = course_code
+            ss.course_details["course_code"] = course_code
 
             course_title = st.text_input(
                 "Course Title",
-                value=st.session_state.course_details["course_title"],
+                value=ss.course_details["course_title"],
                 key="course_title_input"
             )
-            st.session_state.course_details["course_title"] = course_title
+            ss.course_details["course_title"] = course_title
 
             semester = st.selectbox(
                 "Semester",
                 ["1st", "2nd", "Summer"],
-                index=["1st", "2nd", "Summer"].index(st.session_state.course_details["semester"]),
+                index=["1st", "2nd", "Summer"].index(ss.course_details["semester"]),
                 key="semester_select"
             )
-            st.session_state.course_details["semester"] = semester
+            ss.course_details["semester"] = semester
 
         with col2:
             academic_year = st.text_input(
                 "Academic Year",
-                value=st.session_state.course_details["academic_year"],
+                value=ss.course_details["academic_year"],
                 key="academic_year_input"
             )
-            st.session_state.course_details["academic_year"] = academic_year
+            ss.course_details["academic_year"] = academic_year
 
             instructor = st.text_input(
                 "Instructor (optional)",
-                value=st.session_state.course_details["instructor"],
+                value=ss.course_details["instructor"],
                 key="instructor_input"
             )
-            st.session_state.course_details["instructor"] = instructor
+            ss.course_details["instructor"] = instructor
 
             total_hours = st.number_input(
                 "Total Course Hours",
                 min_value=1,
-                value=int(st.session_state.course_details["total_hours"]) if st.session_state.course_details["total_hours"] else 1,
+                value=int(ss.course_details["total_hours"]) if ss.course_details["total_hours"] else 1,
                 key="total_hours_input"
             )
-            st.session_state.course_details["total_hours"] = total_hours
+            ss.course_details["total_hours"] = total_hours
 
         st.info("ℹ️ This information appears in the TOS header.")
 
@@ -390,14 +639,14 @@ with assess_tabs[1]:
     st.markdown("### Learning Outcomes")
 
     # Initialize assessment outcomes
-    if "assessment_outcomes" not in st.session_state:
-        st.session_state.assessment_outcomes = []
+    if "assessment_outcomes" not in ss:
+        ss.assessment_outcomes = []
 
     # ---------------------------------
     # NEW: SHOW THE EXAM TERM BEING USED
     # ---------------------------------
-    current_exam_term = st.session_state.course_details.get("exam_term", "Midterm")
-    extracted_exam_term = st.session_state.get("extracted_exam_term", None)
+    current_exam_term = ss.course_details.get("exam_term", "Midterm")
+    extracted_exam_term = ss.get("extracted_exam_term", None)
     
     if extracted_exam_term:
         if extracted_exam_term == current_exam_term:
@@ -418,30 +667,32 @@ with assess_tabs[1]:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if "extracted_learning_outcomes" in st.session_state and st.session_state.extracted_learning_outcomes:
+        if "extracted_learning_outcomes" in ss and ss.extracted_learning_outcomes:
             if st.button("📄 Use PDF Learning Outcomes", key="btn_pdf_outcomes"):
-                st.session_state.assessment_outcomes = []
-                for outcome_text in st.session_state.extracted_learning_outcomes:
-                    st.session_state.assessment_outcomes.append({
-                        "id": uuid.uuid4().hex,
+                ss.outcomes_rev = ss.get("outcomes_rev", 0) + 1
+                ss.assessment_outcomes = []
+                for outcome_text in ss.extracted_learning_outcomes:
+                    ss.assessment_outcomes.append({
+                        "id": next_row_id(),
                         "outcome": outcome_text,
                         "hours": 0  # teacher assigns hours
                     })
     
     with col2:
-        if "lesson_objectives" in st.session_state and st.session_state.lesson_objectives:
+        if "lesson_objectives" in ss and ss.lesson_objectives:
             if st.button("📥 Use Lesson Objectives", key="btn_lesson_obj"):
-                st.session_state.assessment_outcomes = []
-                for obj in st.session_state.lesson_objectives:
-                    st.session_state.assessment_outcomes.append({
-                        "id": uuid.uuid4().hex,
+                ss.outcomes_rev = ss.get("outcomes_rev", 0) + 1
+                ss.assessment_outcomes = []
+                for obj in ss.lesson_objectives:
+                    ss.assessment_outcomes.append({
+                        "id": next_row_id(),
                         "outcome": obj["objective"],
                         "hours": 0
                     })
 
     # Show status
-    if st.session_state.assessment_outcomes:
-        st.success(f"✅ {len(st.session_state.assessment_outcomes)} outcomes loaded")
+    if ss.assessment_outcomes:
+        st.success(f"✅ {len(ss.assessment_outcomes)} outcomes loaded")
 
     # ---------------------------------
     # MANUAL ADD OUTCOME
@@ -449,25 +700,26 @@ with assess_tabs[1]:
     st.markdown("#### ➕ Add Custom Learning Outcome")
     
     # Initialize session state for inputs BEFORE creating widgets
-    if "lo_text_input" not in st.session_state:
-        st.session_state.lo_text_input = ""
-    if "lo_hours_input" not in st.session_state:
-        st.session_state.lo_hours_input = 0
+    if "lo_text_input" not in ss:
+        ss.lo_text_input = ""
+    if "lo_hours_input" not in ss:
+        ss.lo_hours_input = 0
     
     # Callback to handle adding outcome and clearing inputs
     def add_outcome_callback():
-        lo_text = st.session_state.lo_text_input
-        lo_hours = st.session_state.lo_hours_input
+        lo_text = ss.lo_text_input
+        lo_hours = ss.lo_hours_input
         
         if lo_text and lo_text.strip():
-            st.session_state.assessment_outcomes.append({
-                "id": uuid.uuid4().hex,
+            ss.outcomes_rev = ss.get("outcomes_rev", 0) + 1
+            ss.assessment_outcomes.append({
+                "id": next_row_id(),
                 "outcome": lo_text.strip(),
                 "hours": lo_hours
             })
             # Clear inputs BEFORE rerun (in callback)
-            st.session_state.lo_text_input = ""
-            st.session_state.lo_hours_input = 0
+            ss.lo_text_input = ""
+            ss.lo_hours_input = 0
     
     col1, col2 = st.columns([4, 2])
     
@@ -475,14 +727,14 @@ with assess_tabs[1]:
         lo_text = st.text_input(
             "Learning Outcome",
             key="lo_text_input",
-            value=st.session_state.lo_text_input
+            value=ss.lo_text_input
         )
     
     with col2:
         lo_hours = st.number_input(
             "Hours",
             min_value=0,
-            value=st.session_state.lo_hours_input,
+            value=ss.lo_hours_input,
             key="lo_hours_input"
         )
 
@@ -496,60 +748,79 @@ with assess_tabs[1]:
     # ---------------------------------
     # DISPLAY + EDIT + DELETE
     # ---------------------------------
-    if st.session_state.assessment_outcomes:
-        st.markdown("#### 📋 Learning Outcomes & Hours Management")
-        st.markdown("**Adjust the hours taught for each learning outcome:**")
-
-        edited = False
-
-        for outcome in st.session_state.assessment_outcomes:
-            outcome_id = outcome.get('id', uuid.uuid4().hex)  # Add UUID if missing (legacy data)
-            if 'id' not in outcome:
-                outcome['id'] = outcome_id  # Store it for future use
+    # Fragment: editing hours reruns only this block, not the whole script
+    @st.fragment
+    def _render_outcomes_editor():
+        if ss.assessment_outcomes:
+            st.markdown("#### 📋 Learning Outcomes & Hours Management")
+            st.markdown("**Adjust the hours taught for each learning outcome (add or delete rows in the table):**")
+
+            # One editable grid for all outcomes (edit text/hours, add or delete rows).
+            # Its base data is rebuilt only when outcomes are replaced outside the grid.
+            outcomes_rev = ss.get("outcomes_rev", 0)
+            if ss.get("outcomes_editor_rev") != outcomes_rev:
+                ss.outcomes_editor_df = pd.DataFrame(
+                    {
+                        "id": [o.get("id") or next_row_id() for o in ss.assessment_outcomes],
+                        "Learning Outcome": [o["outcome"] for o in ss.assessment_outcomes],
+                        "Hours": [o["hours"] for o in ss.assessment_outcomes],
+                    }
+                )
+                ss.outcomes_editor_rev = outcomes_rev
+            
+            edited_outcomes_df = st.data_editor(
+                ss.outcomes_editor_df,
+                key=f"outcomes_editor_{outcomes_rev}",
+                num_rows="dynamic",
+                hide_index=True,
+                use_container_width=True,
+                column_order=("Learning Outcome", "Hours"),
+                column_config={
+                    "Learning Outcome": st.column_config.TextColumn(required=True, width="large"),
+                    "Hours": st.column_config.NumberColumn(min_value=0, step=1, required=True, default=0),
+                },
+            )
             
-            col1, col2, col3 = st.columns([5, 2, 1])
+            previous_count = len(ss.assessment_outcomes)
+            ss.assessment_outcomes = [
+                {
+                    "id": outcome_id if isinstance(outcome_id, str) else f"new-{label}",
+                    "outcome": str(text).strip(),
+                    "hours": int(hours)
+                }
+                for label, outcome_id, text, hours in zip(
+                    edited_outcomes_df.index,
+                    edited_outcomes_df["id"],
+                    edited_outcomes_df["Learning Outcome"],
+                    edited_outcomes_df["Hours"],
+                )
+                if pd.notna(text) and str(text).strip() and pd.notna(hours)
+            ]
+            if len(ss.assessment_outcomes) != previous_count:
+                # Adding/deleting changes the outcome count shown outside the fragment
+                st.rerun()
 
+            # Show summary
+            st.markdown("#### 📊 Hours Summary")
+            total_assigned_hours = sum(o["hours"] for o in ss.assessment_outcomes)
+            total_course_hours = ss.course_details.get("total_hours", 0)
+            
+            col1, col2, col3 = st.columns(3)
             with col1:
-                st.write(f"**{st.session_state.assessment_outcomes.index(outcome) + 1}.** {outcome['outcome']}")
-
+                st.metric("Total Hours Assigned", total_assigned_hours)
             with col2:
-                new_hours = st.number_input(
-                    "Hours",
-                    min_value=0,
-                    value=outcome["hours"],
-                    key=f"hrs_{outcome_id}",
-                    label_visibility="collapsed"
-                )
-                if new_hours != outcome["hours"]:
-                    outcome["hours"] = new_hours
-                    edited = True
-
+                st.metric("Total Course Hours", total_course_hours)
             with col3:
-                if st.button("❌", key=f"del_{outcome_id}", help="Delete this outcome"):
-                    st.session_state.assessment_outcomes = [
-                        o for o in st.session_state.assessment_outcomes 
-                        if o.get('id', '') != outcome_id
-                    ]
-
-        # Show summary
-        st.markdown("#### 📊 Hours Summary")
-        total_assigned_hours = sum(o["hours"] for o in st.session_state.assessment_outcomes)
-        total_course_hours = st.session_state.course_details.get("total_hours", 0)
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Hours Assigned", total_assigned_hours)
-        with col2:
-            st.metric("Total Course Hours", total_course_hours)
-        with col3:
-            if total_course_hours > 0:
-                percentage = (total_assigned_hours / total_course_hours) * 100
-                st.metric("Coverage", f"{percentage:.1f}%")
+                if total_course_hours > 0:
+                    percentage = (total_assigned_hours / total_course_hours) * 100
+                    st.metric("Coverage", f"{percentage:.1f}%")
 
-        if total_assigned_hours > total_course_hours and total_course_hours > 0:
-            st.warning(f"⚠️ Total hours assigned ({total_assigned_hours}) exceeds course hours ({total_course_hours})")
-    else:
-        st.info("No learning outcomes added yet. Import from PDF, lesson objectives, or add manually.")
+            if total_assigned_hours > total_course_hours and total_course_hours > 0:
+                st.warning(f"⚠️ Total hours assigned ({total_assigned_hours}) exceeds course hours ({total_course_hours})")
+        else:
+            st.info("No learning outcomes added yet. Import from PDF, lesson objectives, or add manually.")
+
+    _render_outcomes_editor()
 
     # --- Assessment Profile ---
 # -----------------------------
@@ -560,54 +831,27 @@ with assess_tabs[2]:
 
     profile = st.radio(
         "Program Type",
-        ["Board Course", "Non-Board Course (IT/CS)", "Custom"]
+        list(BLOOM_PROFILES)
     )
 
     # -----------------------------
     # DEFAULT PROFILES
     # -----------------------------
-    if profile == "Board Course":
-        defaults = {
-            "Remember": 30,
-            "Understand": 30,
-            "Apply": 20,
-            "Analyze": 10,
-            "Evaluate": 5,
-            "Create": 5
-        }
-    elif profile == "Non-Board Course (IT/CS)":
-        defaults = {
-            "Remember": 10,
-            "Understand": 15,
-            "Apply": 30,
-            "Analyze": 30,
-            "Evaluate": 10,
-            "Create": 5
-        }
-    else:  # Custom
-        defaults = {
-            "Remember": 0,
-            "Understand": 0,
-            "Apply": 0,
-            "Analyze": 0,
-            "Evaluate": 0,
-            "Create": 0
-        }
+    defaults = BLOOM_PROFILES[profile]
 
     st.markdown("#### Adjust Bloom’s Taxonomy Distribution (%)")
 
-    bloom_weights = {}
-    total_percent = 0
-
-    for bloom, value in defaults.items():
-        bloom_weights[bloom] = st.slider(
+    bloom_weights = {
+        bloom: st.slider(
             bloom,
             min_value=0,
             max_value=100,
             value=value,
             step=5
         )
-        total_percent += bloom_weights[bloom]
+        for bloom, value in defaults.items()
+    }
+    total_percent = sum(bloom_weights.values())
 
     # -----------------------------
     # VALIDATION
@@ -622,7 +866,7 @@ with assess_tabs[2]:
     # -----------------------------
     # SAVE TO SESSION STATE
     # -----------------------------
-    st.session_state.bloom_weights = bloom_weights
+    ss.bloom_weights = bloom_weights
 
 
     # --- Generate TOS ---
@@ -630,7 +874,7 @@ with assess_tabs[3]:
     st.markdown("### Generate Table of Specifications")
     
     # Display which exam term we're creating TOS for
-    exam_term = st.session_state.course_details.get("exam_term", "Midterm")
+    exam_term = ss.course_details.get("exam_term", "Midterm")
     st.info(f"📋 Creating TOS for: **{exam_term} Exam**")
 
     # ============================================================
@@ -655,137 +899,130 @@ with assess_tabs[3]:
     )
     
     # Initialize question types in session state if not present
-    if "question_types" not in st.session_state:
-        st.session_state.question_types = get_default_question_types()
-    
-    # Question Type Input UI
-    st.markdown("**Question Types Configuration:**")
+    if "question_types" not in ss:
+        ss.question_types = get_default_question_types()
     
-    col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
-    with col1:
-        st.write("**Question Type**")
-    with col2:
-        st.write("**No. of Items**")
-    with col3:
-        st.write("**Points/Item**")
-    with col4:
-        st.write("**Action**")
-    
-    # Editor rows for question types
-    updated_types = []
-    for idx, qt in enumerate(st.session_state.question_types):
-        col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+    # Fragment: editing question types reruns only the editor, summary and
+    # validation below, not the whole script
+    @st.fragment
+    def _qt_editor():
+        total_items = ss.total_items_input
         
-        with col1:
-            type_name = st.text_input(
-                "Type",
-                value=qt.type,
-                key=f"qt_name_{qt.id}",
-                label_visibility="collapsed"
-            )
+        # Question Type Input UI: one editable grid (add/delete rows built in)
+        st.markdown("**Question Types Configuration:**")
         
-        with col2:
-            num_items = st.number_input(
-                "Items",
-                value=qt.items,
-                min_value=0,
-                step=1,
-                key=f"qt_items_{qt.id}",
-                label_visibility="collapsed"
+        # The editor's base data stays fixed across reruns; edits are read back
+        # from its return value (feeding edits back in would re-apply them)
+        if "qt_editor_df" not in ss:
+            ss.qt_editor_df = pd.DataFrame(
+                {
+                    "id": [qt.id for qt in ss.question_types],
+                    "Question Type": [qt.type for qt in ss.question_types],
+                    "No. of Items": [qt.items for qt in ss.question_types],
+                    "Points/Item": [float(qt.points_per_item) for qt in ss.question_types],
+                }
             )
         
-        with col3:
-            points_per = st.number_input(
-                "Points",
-                value=float(qt.points_per_item),
-                min_value=0.0,
-                step=0.5,
-                key=f"qt_points_{qt.id}",
-                label_visibility="collapsed"
+        edited_qt_df = st.data_editor(
+            ss.qt_editor_df,
+            key="qt_editor",
+            num_rows="dynamic",
+            hide_index=True,
+            use_container_width=True,
+            column_order=("Question Type", "No. of Items", "Points/Item"),
+            column_config={
+                "Question Type": st.column_config.TextColumn(required=True, default="New Type"),
+                "No. of Items": st.column_config.NumberColumn(min_value=0, step=1, required=True, default=0),
+                "Points/Item": st.column_config.NumberColumn(min_value=0.0, step=0.5, required=True, default=1.0),
+            },
+        )
+        
+        # Rebuild QuestionType objects; rows added in the grid get an id from their row label
+        ss.question_types = [
+            QuestionType(
+                str(type_name),
+                int(num_items),
+                float(points_per),
+                id=qt_id if isinstance(qt_id, str) else f"new-{label}"
+            )
+            for label, qt_id, type_name, num_items, points_per in zip(
+                edited_qt_df.index,
+                edited_qt_df["id"],
+                edited_qt_df["Question Type"],
+                edited_qt_df["No. of Items"],
+                edited_qt_df["Points/Item"],
             )
+            if pd.notna(type_name) and pd.notna(num_items) and pd.notna(points_per)
+        ]
+        
+        # ========================================================================
+        # SINGLE SOURCE OF TRUTH FOR TOTALS
+        # ========================================================================
+        # Compute total items and total points using a SINGLE function call.
+        # This ensures perfect synchronization across all UI panels.
+        # 
+        # Why? Previously, totals were computed in multiple places:
+        # - In summary table
+        # - In validation metrics
+        # - In export logic
+        # 
+        # This caused inconsistencies when items/points changed.
+        # Now, compute_question_type_totals() is the ONLY place where totals
+        # are calculated, and all UI panels use these values.
+        # ========================================================================
+        qt_key = question_types_key(ss.question_types)
+        total_qt_items, total_qt_points = cached_question_type_totals(qt_key)
+        
+        # Display summary table
+        # NOTE: The summary includes a TOTAL row computed by format_question_types_for_display()
+        # This TOTAL row must match the values from compute_question_type_totals() above.
+        st.markdown("**Summary:**")
+        df_summary = cached_question_types_summary_df(qt_key)
+        st.dataframe(df_summary, use_container_width=True, hide_index=True)
+        
+        # Validation and metrics
+        # NOTE: All metrics use the totals computed above (total_qt_items, total_qt_points)
+        # This ensures the top panel and bottom summary always show the same values.
+        st.markdown("#### ✅ Validation & Metrics")
         
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Items (Expected)", total_items)
+        with col2:
+            # This value comes from compute_question_type_totals() - SINGLE SOURCE OF TRUTH
+            st.metric("Total Items (Configured)", total_qt_items)
+        with col3:
+            # This value comes from compute_question_type_totals() - SINGLE SOURCE OF TRUTH
+            st.metric("Total Points (Computed)", f"{total_qt_points:.1f}")
         with col4:
-            if st.button("❌", key=f"del_qt_{qt.id}", help="Remove this question type"):
-                # Filter out the deleted type by ID
-                st.session_state.question_types = [
-                    q for q in st.session_state.question_types if q.id != qt.id
-                ]
-                st.rerun()
-            else:
-                updated_types.append(
-                    QuestionType(type_name, int(num_items), float(points_per), id=qt.id)
-                )
-    
-    # Update session state with edited types
-    if updated_types:
-        st.session_state.question_types = updated_types
-    
-    # Add new question type button
-    if st.button("➕ Add Question Type"):
-        st.session_state.question_types.append(
-            QuestionType("New Type", 0, 1)
+            # Validation: configured items must equal expected items
+            items_match = total_qt_items == total_items
+            status = "✅ Match" if items_match else "❌ Mismatch"
+            st.metric("Items Validation", status)
+        
+        # Validation errors
+        is_valid, validation_errors = validate_question_type_distribution(
+            ss.question_types,
+            total_items
         )
-        st.rerun()
-    
-    # ========================================================================
-    # SINGLE SOURCE OF TRUTH FOR TOTALS
-    # ========================================================================
-    # Compute total items and total points using a SINGLE function call.
-    # This ensures perfect synchronization across all UI panels.
-    # 
-    # Why? Previously, totals were computed in multiple places:
-    # - In summary table
-    # - In validation metrics
-    # - In export logic
-    # 
-    # This caused inconsistencies when items/points changed.
-    # Now, compute_question_type_totals() is the ONLY place where totals
-    # are calculated, and all UI panels use these values.
-    # ========================================================================
-    total_qt_items, total_qt_points = compute_question_type_totals(
-        st.session_state.question_types
-    )
-    
-    # Display summary table
-    # NOTE: The summary includes a TOTAL row computed by format_question_types_for_display()
-    # This TOTAL row must match the values from compute_question_type_totals() above.
-    st.markdown("**Summary:**")
-    summary_data = format_question_types_for_display(st.session_state.question_types)
-    df_summary = pd.DataFrame(summary_data)
-    st.dataframe(df_summary, use_container_width=True, hide_index=True)
-    
-    # Validation and metrics
-    # NOTE: All metrics use the totals computed above (total_qt_items, total_qt_points)
-    # This ensures the top panel and bottom summary always show the same values.
-    st.markdown("#### ✅ Validation & Metrics")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Total Items (Expected)", total_items)
-    with col2:
-        # This value comes from compute_question_type_totals() - SINGLE SOURCE OF TRUTH
-        st.metric("Total Items (Configured)", total_qt_items)
-    with col3:
-        # This value comes from compute_question_type_totals() - SINGLE SOURCE OF TRUTH
-        st.metric("Total Points (Computed)", f"{total_qt_points:.1f}")
-    with col4:
-        # Validation: configured items must equal expected items
-        items_match = total_qt_items == total_items
-        status = "✅ Match" if items_match else "❌ Mismatch"
-        st.metric("Items Validation", status)
-    
-    # Validation errors
-    is_valid, validation_errors = validate_question_type_distribution(
-        st.session_state.question_types,
-        total_items
-    )
-    
-    if validation_errors:
-        for error in validation_errors:
-            st.error(f"❌ {error}")
-    
-    if is_valid and st.session_state.question_types:
-        st.success("✅ Question type distribution is valid!")
+        
+        if validation_errors:
+            for error in validation_errors:
+                st.error(f"❌ {error}")
+        
+        if is_valid and ss.question_types:
+            st.success("✅ Question type distribution is valid!")
+        
+        # The Generate button lives outside this fragment: rerun the whole page
+        # only when validity flips, so its enabled state stays in sync
+        previous_valid = ss.get("qt_distribution_valid")
+        ss.qt_distribution_valid = is_valid
+        if previous_valid is not None and previous_valid != is_valid:
+            st.rerun()
+
+
+    _qt_editor()
+    is_valid = ss.qt_distribution_valid
     
     # ============================================================
     # SECTION 3: GENERATE TOS
@@ -799,7 +1036,7 @@ with assess_tabs[3]:
         # -------------------------------
         # VALIDATION
         # -------------------------------
-        if "assessment_outcomes" not in st.session_state or not st.session_state.assessment_outcomes:
+        if "assessment_outcomes" not in ss or not ss.assessment_outcomes:
             st.error("Please define learning outcomes first.")
             st.stop()
 
@@ -810,15 +1047,16 @@ with assess_tabs[3]:
         # -------------------------------
         # PREPARE INPUTS FOR SERVICE
         # -------------------------------
-        outcomes = []
-        for idx, o in enumerate(st.session_state.assessment_outcomes):
-            outcomes.append({
+        outcomes = [
+            {
                 "id": idx,
                 "text": o["outcome"],
                 "hours": o["hours"]
-            })
+            }
+            for idx, o in enumerate(ss.assessment_outcomes)
+        ]
 
-        bloom_weights = st.session_state.get("bloom_weights")
+        bloom_weights = ss.get("bloom_weights")
 
         if not bloom_weights:
             st.error("Please configure Bloom’s Taxonomy profile.")
@@ -834,15 +1072,19 @@ with assess_tabs[3]:
             total_items=total_items
         )
         
+        _, total_qt_points = cached_question_type_totals(
+            question_types_key(ss.question_types)
+        )
+        
         # Store extended TOS with question type distribution
         # NOTE: total_points is computed from compute_question_type_totals()
         # This uses the SINGLE SOURCE OF TRUTH, not a separate calculation
-        st.session_state.generated_tos = {
+        ss.generated_tos = {
             "outcomes": outcomes,
             "tos_matrix": result["tos_matrix"],
             "bloom_totals": result["bloom_totals"],
             # Question type distribution
-            "question_types": st.session_state.question_types,
+            "question_types": ss.question_types,
             "total_items": total_items,
             # Computed total points - derived from compute_question_type_totals()
             "total_points": total_qt_points
@@ -852,10 +1094,10 @@ with assess_tabs[3]:
         assigned_slots, _ = assign_question_types_to_bloom_slots(
             tos_matrix=result["tos_matrix"],
             outcomes=outcomes,
-            question_types_list=st.session_state.question_types,
+            question_types_list=ss.question_types,
             shuffle=True
         )
-        st.session_state.assigned_slots = assigned_slots
+        ss.assigned_slots = assigned_slots
 
         # -------------------------------
         # DISPLAY RESULT
@@ -865,14 +1107,7 @@ with assess_tabs[3]:
         tos_matrix = result["tos_matrix"]
 
         # Convert to table
-        table_data = []
-        for o in outcomes:
-            row = {"Learning Outcome": o["text"]}
-            for bloom in tos_matrix:
-                row[bloom] = tos_matrix[bloom].get(o["id"], 0)
-            table_data.append(row)
-
-        df = pd.DataFrame(table_data)
+        df = cached_tos_table_df(tos_table_key(outcomes, tos_matrix))
         st.dataframe(df, use_container_width=True)
 
         # Show Bloom totals
@@ -880,18 +1115,18 @@ with assess_tabs[3]:
         st.json(result["bloom_totals"])
 
     # Quick export after TOS generation
-    if "generated_tos" in st.session_state:
+    if "generated_tos" in ss:
         st.markdown("#### 📥 Export TOS")
         if st.button("⬇ Export TOS as Excel", key="btn_export_tos_generate_tab"):
 
-            exam_term = st.session_state.course_details.get("exam_term", "Midterm")
-            course_code = st.session_state.course_details.get("course_code", "")
-            course_title = st.session_state.course_details.get("course_title", "")
-            semester = st.session_state.course_details.get("semester", "")
-            instructor = st.session_state.course_details.get("instructor", "")
-            academic_year = st.session_state.course_details.get("academic_year", "")
+            exam_term = ss.course_details.get("exam_term", "Midterm")
+            course_code = ss.course_details.get("course_code", "")
+            course_title = ss.course_details.get("course_title", "")
+            semester = ss.course_details.get("semester", "")
+            instructor = ss.course_details.get("instructor", "")
+            academic_year = ss.course_details.get("academic_year", "")
 
-            total_points = st.session_state.generated_tos.get("total_points", 0)
+            total_points = ss.generated_tos.get("total_points", 0)
 
             excel = export_tos_exact_format(
                 meta={
@@ -906,9 +1141,9 @@ with assess_tabs[3]:
                     "exam_date": "",
                     "course_content": ""
                 },
-                outcomes=st.session_state.generated_tos["outcomes"],
-                tos_matrix=st.session_state.generated_tos["tos_matrix"],
-                total_items=st.session_state.generated_tos.get("total_items", 0),
+                outcomes=ss.generated_tos["outcomes"],
+                tos_matrix=ss.generated_tos["tos_matrix"],
+                total_items=ss.generated_tos.get("total_items", 0),
                 total_points=int(total_points)
             )
 
@@ -932,40 +1167,38 @@ with assess_tabs[4]:
         # HELPER FUNCTIONS FOR EDITABLE TOS
         # ======================================================
         
-        def delete_outcome_from_tos(tos_data: Dict, outcome_id) -> Dict:
-            """Remove an outcome from TOS and update the matrix."""
-            if not tos_data:
+        def delete_outcomes_from_tos(tos_data: Dict, outcome_ids) -> Dict:
+            """Remove a set of outcomes from TOS and update the matrix in one pass."""
+            if not tos_data or not outcome_ids:
                 return tos_data
+            
+            outcome_ids = set(outcome_ids)
                 
             # Remove from learning_outcomes
             tos_data["learning_outcomes"] = [
                 o for o in tos_data.get("learning_outcomes", [])
-                if o.get("id") != outcome_id
+                if o.get("id") not in outcome_ids
             ]
             
             # Remove from tos_matrix for each Bloom level
             tos_matrix = tos_data.get("tos_matrix", {})
-            outcome_key = str(outcome_id)  # Handle both int and string keys
-            
-            for bloom_level in tos_matrix:
-                if outcome_key in tos_matrix[bloom_level]:
-                    del tos_matrix[bloom_level][outcome_key]
-                # Also try numeric version
-                if outcome_id in tos_matrix[bloom_level]:
-                    del tos_matrix[bloom_level][outcome_id]
+            # Handle both int and string keys
+            matrix_keys = outcome_ids | {str(outcome_id) for outcome_id in outcome_ids}
             
-            # Recalculate total_items
+            # Drop the outcomes and recalculate total_items in the same pass
             total = 0
-            for bloom_level in tos_matrix:
-                for item_count in tos_matrix[bloom_level].values():
-                    total += item_count
+            for slots in tos_matrix.values():
+                for key in matrix_keys:
+                    slots.pop(key, None)
+                total += sum(slots.values())
             tos_data["total_items"] = total
             
             return tos_data
         
         def calculate_mixed_distribution_slots(
             tos_data: Dict,
-            distribution: Dict[str, Dict[str, float]]
+            distribution: Dict[str, Dict[str, float]],
+            seed: int = 0
         ) -> Tuple[bool, Any]:
             """
             Convert mixed type distribution to assigned slots.
@@ -975,6 +1208,9 @@ with assess_tabs[4]:
                 'Essay': {'items': 10, 'points_per_item': 5.0},
                 ...
             }
+            
+            The same TOS, distribution and seed give the same slots, so the result
+            is memoized; a reshuffle draws a new seed.
             """
             try:
                 total_slots_needed = tos_data.get("total_items", 0)
@@ -989,42 +1225,33 @@ with assess_tabs[4]:
                     outcomes = tos_data.get("outcomes", [])
                 tos_matrix = tos_data.get("tos_matrix", {})
                 
-                # Create a list of all type slots based on distribution
-                type_slots = []
-                for q_type, config in distribution.items():
-                    for _ in range(int(config.get("items", 0))):
-                        type_slots.append({
-                            "type": q_type,
-                            "points": float(config.get("points_per_item", 1.0))
-                        })
+                # Hashable snapshots: outcome fields resolved and matrix keys (int or str) normalized once
+                outcome_index = tuple(
+                    (outcome.get("id", outcome.get("_id")), outcome.get("text", outcome.get("description")))
+                    for outcome in outcomes
+                )
+                matrix_key = tuple(
+                    (bloom, tuple((str(k), v) for k, v in tos_matrix.get(bloom, {}).items()))
+                    for bloom in BLOOMS
+                )
+                dist_key = tuple(
+                    (q_type, int(config.get("items", 0)), float(config.get("points_per_item", 1.0)))
+                    for q_type, config in distribution.items()
+                )
                 
-                # Shuffle type slots for randomness
-                random.shuffle(type_slots)
+                rows = _build_mixed_slots(outcome_index, matrix_key, dist_key, seed)
                 
                 # Create assigned slots
-                assigned_slots = []
-                slot_index = 0
-                
-                for bloom in ["Remember", "Understand", "Apply", "Analyze", "Evaluate", "Create"]:
-                    bloom_row = tos_matrix.get(bloom, {})
-                    for outcome in outcomes:
-                        outcome_id = outcome.get("id", outcome.get("_id"))
-                        outcome_text = outcome.get("text", outcome.get("description"))
-                        
-                        # Get count (handle both string and int keys)
-                        count = bloom_row.get(outcome_id, bloom_row.get(str(outcome_id), 0))
-                        
-                        for _ in range(count):
-                            if slot_index < len(type_slots):
-                                slot = {
-                                    "outcome_id": outcome_id,
-                                    "outcome_text": outcome_text,
-                                    "bloom_level": bloom,
-                                    "question_type": type_slots[slot_index]["type"],
-                                    "points": type_slots[slot_index]["points"]
-                                }
-                                assigned_slots.append(slot)
-                                slot_index += 1
+                assigned_slots = [
+                    {
+                        "outcome_id": outcome_id,
+                        "outcome_text": outcome_text,
+                        "bloom_level": bloom,
+                        "question_type": q_type,
+                        "points": points
+                    }
+                    for bloom, outcome_id, outcome_text, q_type, points in rows
+                ]
                 
                 return True, assigned_slots
                 
@@ -1038,21 +1265,21 @@ with assess_tabs[4]:
         st.markdown("#### 📋 Step 1: Select TOS Source")
         
         # Initialize session state for editable TOS
-        if "tqs_tos_source" not in st.session_state:
-            st.session_state.tqs_tos_source = "generated"
-        if "uploaded_tos_data" not in st.session_state:
-            st.session_state.uploaded_tos_data = None
-        if "edited_tos_data" not in st.session_state:
-            st.session_state.edited_tos_data = None
-        if "tqs_test_type_config" not in st.session_state:
-            st.session_state.tqs_test_type_config = None
+        if "tqs_tos_source" not in ss:
+            ss.tqs_tos_source = "generated"
+        if "uploaded_tos_data" not in ss:
+            ss.uploaded_tos_data = None
+        if "edited_tos_data" not in ss:
+            ss.edited_tos_data = None
+        if "tqs_test_type_config" not in ss:
+            ss.tqs_test_type_config = None
         
         tos_source = st.radio(
             "Choose TOS source:",
             ["Use Generated TOS (from system)", "Upload TOS from File"],
             key="tos_source_radio"
         )
-        st.session_state.tqs_tos_source = tos_source
+        ss.tqs_tos_source = tos_source
         
         # ======================================================
         # SECTION: FILE UPLOAD (if selected)
@@ -1069,26 +1296,31 @@ with assess_tabs[4]:
             )
             
             if uploaded_file is not None:
-                file_content = uploaded_file.read()
                 file_name = uploaded_file.name
+                # Hash the upload's buffer in place; the parser reads the file object
+                # directly, so the contents are never copied into a separate bytes object
+                with uploaded_file.getbuffer() as file_buffer:
+                    file_digest = hashlib.blake2b(file_buffer, digest_size=16).hexdigest()
                 
-                # Parse TOS file
-                success, tos_result = parse_tos_file(
-                    file_content,
+                # Parse TOS file (cached: reruns with the same upload skip re-parsing)
+                success, tos_result = cached_parse_tos_file(
+                    file_digest,
+                    uploaded_file,
                     file_name
                 )
                 
                 if success:
                     # Validate TOS
-                    is_valid, validation_msg = validate_tos_for_tqs_generation(tos_result)
+                    is_valid, validation_msg = cached_validate_tos(file_digest, file_name, tos_result)
                     
                     if is_valid:
                         st.success(f"✅ {validation_msg}")
                         
-                        # Store as edited data (working copy)
-                        if st.session_state.edited_tos_data is None:
-                            st.session_state.edited_tos_data = tos_result.copy()
-                        st.session_state.uploaded_tos_data = tos_result.copy()
+                        # Store as edited data (deep working copy, made once); the parsed
+                        # upload itself is kept as a read-only reference, never mutated
+                        if ss.edited_tos_data is None:
+                            ss.edited_tos_data = copy.deepcopy(tos_result)
+                        ss.uploaded_tos_data = tos_result
                         
                         # Show TOS summary
                         with st.expander("📊 TOS Details", expanded=False):
@@ -1103,28 +1335,29 @@ with assess_tabs[4]:
                                 st.metric("Format", tos_result.get("metadata", {}).get("parsing_method", "unknown"))
                             
                             # Show outcomes
-                            st.write("**Learning Outcomes:**")
-                            for outcome in tos_result.get("learning_outcomes", []):
-                                st.write(f"- {outcome.get('text', outcome.get('description'))} (ID: {outcome.get('id')})")
+                            st.markdown("**Learning Outcomes:**\n\n" + "\n".join(
+                                f"- {outcome.get('text', outcome.get('description'))} (ID: {outcome.get('id')})"
+                                for outcome in tos_result.get("learning_outcomes", [])
+                            ))
                     else:
                         st.error(f"❌ TOS validation failed: {validation_msg}")
-                        st.session_state.uploaded_tos_data = None
-                        st.session_state.edited_tos_data = None
+                        ss.uploaded_tos_data = None
+                        ss.edited_tos_data = None
                 
                 else:
                     error_msg = tos_result.get("error", "Unknown error") if isinstance(tos_result, dict) else tos_result
                     st.error(f"❌ Failed to parse TOS file: {error_msg}")
-                    st.session_state.uploaded_tos_data = None
-                    st.session_state.edited_tos_data = None
+                    ss.uploaded_tos_data = None
+                    ss.edited_tos_data = None
         
         # ======================================================
         # CHECK: Do we have a valid TOS (generated or uploaded)?
         # ======================================================
         has_generated_tos = (
-            "generated_tos" in st.session_state and 
-            st.session_state.generated_tos is not None
+            "generated_tos" in ss and 
+            ss.generated_tos is not None
         )
-        has_uploaded_tos = st.session_state.edited_tos_data is not None
+        has_uploaded_tos = ss.edited_tos_data is not None
         
         if not has_generated_tos and not has_uploaded_tos:
             if tos_source == "Upload TOS from File":
@@ -1140,51 +1373,48 @@ with assess_tabs[4]:
             st.markdown("#### ✏️ Step 2: Edit Learning Outcomes")
             st.write("Review and edit your learning outcomes. Deleting an outcome will update the assessment matrix.")
             
-            working_tos = st.session_state.edited_tos_data
+            working_tos = ss.edited_tos_data
             outcomes = working_tos.get("learning_outcomes", [])
             
             if outcomes:
-                # Create editable outcomes table
-                col1, col2, col3 = st.columns([3, 1, 0.5])
-                with col1:
-                    st.write("**Outcome Text**")
-                with col2:
-                    st.write("**Hours**")
-                with col3:
-                    st.write("**Delete**")
-                
-                st.divider()
-                
-                # Display outcomes with delete buttons
-                outcomes_to_delete = []
-                for idx, outcome in enumerate(outcomes):
-                    outcome_id = outcome.get("id")
-                    outcome_text = outcome.get("text", outcome.get("description", ""))
-                    outcome_hours = outcome.get("hours", 0)
-                    
-                    col1, col2, col3 = st.columns([3, 1, 0.5])
-                    
-                    with col1:
-                        st.text(outcome_text[:80])
-                    with col2:
-                        st.text(str(outcome_hours))
-                    with col3:
-                        if st.button("❌", key=f"del_outcome_{outcome_id}_{idx}", help="Delete this outcome"):
-                            outcomes_to_delete.append(outcome_id)
+                # One grid for all outcomes; tick "Delete" to remove a row
+                outcome_ids = [outcome.get("id") for outcome in outcomes]
+                outcomes_df = pd.DataFrame({
+                    "Outcome Text": [outcome.get("text", outcome.get("description", "")) for outcome in outcomes],
+                    "Hours": [outcome.get("hours", 0) for outcome in outcomes],
+                    "Delete": [False] * len(outcomes),
+                })
+                edited_outcomes = st.data_editor(
+                    outcomes_df,
+                    key=f"tos_outcomes_editor_{ss.get('tos_outcomes_rev', 0)}",
+                    hide_index=True,
+                    use_container_width=True,
+                    disabled=("Outcome Text", "Hours"),
+                    column_config={
+                        "Outcome Text": st.column_config.TextColumn(width="large"),
+                        "Delete": st.column_config.CheckboxColumn(help="Delete this outcome"),
+                    },
+                )
+                outcomes_to_delete = [
+                    outcome_id
+                    for outcome_id, marked in zip(outcome_ids, edited_outcomes["Delete"])
+                    if marked
+                ]
                 
                 # Handle deletions
                 if outcomes_to_delete:
-                    for outcome_id in outcomes_to_delete:
-                        st.session_state.edited_tos_data = delete_outcome_from_tos(
-                            st.session_state.edited_tos_data,
-                            outcome_id
-                        )
+                    ss.edited_tos_data = delete_outcomes_from_tos(
+                        ss.edited_tos_data,
+                        outcomes_to_delete
+                    )
+                    # Fresh editor state: the old one refers to rows that no longer exist
+                    ss.tos_outcomes_rev = ss.get("tos_outcomes_rev", 0) + 1
                     st.success(f"✅ Deleted {len(outcomes_to_delete)} outcome(s). Matrix updated.")
                     st.rerun()
                 
                 # Show summary after edits
-                st.markdown(f"**Total Learning Outcomes:** {len(st.session_state.edited_tos_data.get('learning_outcomes', []))}")
-                st.markdown(f"**Total Items:** {st.session_state.edited_tos_data.get('total_items', 0)}")
+                st.markdown(f"**Total Learning Outcomes:** {len(ss.edited_tos_data.get('learning_outcomes', []))}")
+                st.markdown(f"**Total Items:** {ss.edited_tos_data.get('total_items', 0)}")
             
             st.divider()
         
@@ -1193,7 +1423,13 @@ with assess_tabs[4]:
         # ======================================================
         st.markdown("#### 🎯 Step 3: Select Test Type Configuration")
         
-        working_tos = st.session_state.edited_tos_data if has_uploaded_tos else st.session_state.generated_tos
+        working_tos = ss.edited_tos_data if has_uploaded_tos else ss.generated_tos
+        
+        # Generate is a submit button of the active configuration form, so
+        # clicking it always applies any pending edits in that form first
+        generate_clicked = False
+        reshuffle_slots = False
+        
         test_type_mode = st.radio(
             "Test Configuration:",
             ["Single Question Type", "Mixed Question Types"],
@@ -1205,26 +1441,38 @@ with assess_tabs[4]:
         # SINGLE TYPE CONFIGURATION
         # ======================================================
         if test_type_mode == "Single Question Type":
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                single_type = st.selectbox(
-                    "Question Type:",
-                    ["MCQ", "True or False", "Essay", "Short Answer", "Problem Solving"],
-                    key="single_question_type"
-                )
-            
-            with col2:
-                points_per_item = st.number_input(
-                    "Points per Item:",
-                    min_value=0.5,
-                    value=1.0,
-                    step=0.5,
-                    key="single_points_per_item"
-                )
+            # Inputs only take effect (and rerun the script) when the form is applied
+            with st.form("single_type_form"):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    single_type = st.selectbox(
+                        "Question Type:",
+                        QUESTION_TYPES,
+                        key="single_question_type"
+                    )
+                
+                with col2:
+                    points_per_item = st.number_input(
+                        "Points per Item:",
+                        min_value=0.5,
+                        value=1.0,
+                        step=0.5,
+                        key="single_points_per_item"
+                    )
+                
+                col_apply, col_generate = st.columns(2)
+                with col_apply:
+                    st.form_submit_button("Apply Configuration", use_container_width=True)
+                with col_generate:
+                    generate_clicked = st.form_submit_button(
+                        "🚀 Generate Test Questions",
+                        type="primary",
+                        use_container_width=True
+                    )
             
             # Store configuration
-            st.session_state.tqs_test_type_config = {
+            ss.tqs_test_type_config = {
                 "mode": "single",
                 "type": single_type,
                 "points_per_item": points_per_item
@@ -1239,51 +1487,78 @@ with assess_tabs[4]:
             total_items = working_tos.get("total_items", 0)
             
             mixed_config = {}
-            question_types = ["MCQ", "True or False", "Essay", "Short Answer", "Problem Solving"]
-            
-            col1, col2, col3 = st.columns(3)
-            col_list = [col1, col2, col3, col1, col2]
+            question_types = QUESTION_TYPES
             
-            for idx, q_type in enumerate(question_types):
-                with col_list[idx]:
-                    st.write(f"**{q_type}**")
-                    items = st.number_input(
-                        f"Items ({q_type})",
-                        min_value=0,
-                        max_value=total_items,
-                        value=0,
-                        step=1,
-                        key=f"mixed_items_{q_type}"
-                    )
-                    points = st.number_input(
-                        f"Points per item ({q_type})",
-                        min_value=0.5,
-                        value=1.0,
-                        step=0.5,
-                        key=f"mixed_points_{q_type}"
+            # One form for the whole grid: typing a distribution doesn't rerun the
+            # script per keystroke; the values below are the last applied ones
+            with st.form("mixed_dist_form"):
+                col1, col2, col3 = st.columns(3)
+                col_list = [col1, col2, col3, col1, col2]
+                
+                for idx, q_type in enumerate(question_types):
+                    with col_list[idx]:
+                        st.write(f"**{q_type}**")
+                        items = st.number_input(
+                            f"Items ({q_type})",
+                            min_value=0,
+                            max_value=total_items,
+                            value=0,
+                            step=1,
+                            key=f"mixed_items_{q_type}"
+                        )
+                        points = st.number_input(
+                            f"Points per item ({q_type})",
+                            min_value=0.5,
+                            value=1.0,
+                            step=0.5,
+                            key=f"mixed_points_{q_type}"
+                        )
+                        
+                        if items > 0:
+                            mixed_config[q_type] = {
+                                "items": items,
+                                "points_per_item": points
+                            }
+                
+                reshuffle_slots = st.checkbox(
+                    "🔀 Reshuffle question-type assignment",
+                    key="tqs_reshuffle_slots",
+                    help="Unchecked, regenerating with the same TOS and configuration reuses the previous slot assignment."
+                )
+                
+                col_apply, col_generate = st.columns(2)
+                with col_apply:
+                    st.form_submit_button("Apply Distribution", use_container_width=True)
+                with col_generate:
+                    generate_clicked = st.form_submit_button(
+                        "🚀 Generate Test Questions",
+                        type="primary",
+                        use_container_width=True
                     )
-                    
-                    if items > 0:
-                        mixed_config[q_type] = {
-                            "items": items,
-                            "points_per_item": points
-                        }
             
-            # Validate distribution
-            total_in_dist = sum(config.get("items", 0) for config in mixed_config.values())
+            total_in_dist = 0
+            total_dist_points = 0.0
             
-            if total_in_dist == 0:
+            # Validate distribution (nothing assigned yet is the common case: skip the totals)
+            if not mixed_config:
                 st.warning(f"⚠️ Assign at least some items to question types")
-            elif total_in_dist != total_items:
-                st.error(f"❌ Distribution total ({total_in_dist}) must equal TOS total ({total_items})")
             else:
-                st.success(f"✅ Distribution valid: {total_in_dist} items across {len(mixed_config)} types")
+                # Item and point totals in one pass; stored with the config for the summary
+                for config in mixed_config.values():
+                    total_in_dist += config["items"]
+                    total_dist_points += config["items"] * config["points_per_item"]
+                
+                if total_in_dist != total_items:
+                    st.error(f"❌ Distribution total ({total_in_dist}) must equal TOS total ({total_items})")
+                else:
+                    st.success(f"✅ Distribution valid: {total_in_dist} items across {len(mixed_config)} types")
             
             # Store configuration
-            st.session_state.tqs_test_type_config = {
+            ss.tqs_test_type_config = {
                 "mode": "mixed",
                 "distribution": mixed_config,
-                "total_items": total_items
+                "total_items": total_items,
+                "total_points": total_dist_points
             }
         
         st.divider()
@@ -1294,18 +1569,17 @@ with assess_tabs[4]:
         st.markdown("#### 🚀 Step 4: Generate Test Questions")
         
         # Prepare configuration summary
-        config = st.session_state.tqs_test_type_config
+        config = ss.tqs_test_type_config
         if config:
             if config.get("mode") == "single":
                 st.info(f"📌 Configuration: {config['type']} ({config['points_per_item']} pts each)")
             else:
-                total_pts = sum(
-                    c.get("items", 0) * c.get("points_per_item", 1.0)
-                    for c in config.get("distribution", {}).values()
-                )
+                total_pts = config.get("total_points", 0)
                 st.info(f"📌 Mixed Configuration: {len(config.get('distribution', {}))} types, {config.get('total_items', 0)} items, {total_pts:.0f} pts total")
         
-        if st.button("🚀 Generate Test Questions", key="btn_generate_tqs_enhanced"):
+        st.caption("Use **🚀 Generate Test Questions** in the configuration form above; it applies any unsaved edits there first.")
+        
+        if generate_clicked:
             # Validate configuration
             if not config:
                 st.error("❌ Please configure test type settings first.")
@@ -1313,10 +1587,10 @@ with assess_tabs[4]:
             
             # Get TOS to use
             if has_uploaded_tos:
-                tos_to_use = st.session_state.edited_tos_data
+                tos_to_use = ss.edited_tos_data
                 source_label = "Uploaded TOS"
             else:
-                tos_to_use = st.session_state.generated_tos
+                tos_to_use = ss.generated_tos
                 source_label = "Generated TOS"
             
             if not tos_to_use:
@@ -1341,9 +1615,12 @@ with assess_tabs[4]:
                             points_per_item=config["points_per_item"]
                         )
                     else:  # mixed mode
+                        if reshuffle_slots or "tqs_slot_seed" not in ss:
+                            ss.tqs_slot_seed = random.randrange(2**32)
                         success, assigned_slots = calculate_mixed_distribution_slots(
                             tos_to_use,
-                            config.get("distribution", {})
+                            config.get("distribution", {}),
+                            seed=ss.tqs_slot_seed
                         )
                     
                     if not success:
@@ -1358,9 +1635,9 @@ with assess_tabs[4]:
                     )
                 
                 if tqs:
-                    st.session_state.generated_tqs = tqs
+                    ss.generated_tqs = normalize_tqs_fields(tqs)
                     stats = get_tqs_statistics(tqs)
-                    st.session_state.tqs_stats = stats
+                    ss.tqs_stats = stats
                     
                     # Check if we have partial generation
                     expected_count = len(assigned_slots)
@@ -1386,7 +1663,7 @@ with assess_tabs[4]:
                         """)
                         
                         # Store assigned_slots in session for potential regeneration
-                        st.session_state.last_assigned_slots = assigned_slots
+                        ss.last_assigned_slots = assigned_slots
                         
                         # Offer to regenerate missing questions
                         col1, col2 = st.columns(2)
@@ -1404,13 +1681,13 @@ with assess_tabs[4]:
                                         )
                                         if regenerated:
                                             # Merge with existing TQS
-                                            st.session_state.generated_tqs.extend(regenerated)
+                                            ss.generated_tqs.extend(normalize_tqs_fields(regenerated))
                                             # Sort by question number
-                                            st.session_state.generated_tqs = sorted(
-                                                st.session_state.generated_tqs,
+                                            ss.generated_tqs = sorted(
+                                                ss.generated_tqs,
                                                 key=lambda q: int(q.get('question_number', 0))
                                             )
-                                            st.success(f"✅ Regenerated {len(regenerated)} question(s)! Now have {len(st.session_state.generated_tqs)} total.")
+                                            st.success(f"✅ Regenerated {len(regenerated)} question(s)! Now have {len(ss.generated_tqs)} total.")
                                             st.rerun()
                                         else:
                                             st.error("❌ Failed to regenerate missing questions. Try again later.")
@@ -1455,11 +1732,11 @@ with assess_tabs[4]:
         # ======================================================
         # TQS STATISTICS & PREVIEW
         # ======================================================
-        if "generated_tqs" in st.session_state and st.session_state.generated_tqs:
+        if "generated_tqs" in ss and ss.generated_tqs:
             st.markdown("#### 📊 Test Question Summary")
             
-            tqs = st.session_state.generated_tqs
-            stats = st.session_state.tqs_stats
+            tqs = ss.generated_tqs
+            stats, df_types, df_bloom = cached_tqs_stats_frames(tqs_stats_key(tqs))
             
             # Summary metrics
             col1, col2, col3, col4 = st.columns(4)
@@ -1474,26 +1751,10 @@ with assess_tabs[4]:
             
             # Breakdown by type
             st.markdown("##### By Question Type")
-            type_data = []
-            for qtype in sorted(stats["questions_by_type"].keys()):
-                type_data.append({
-                    "Type": qtype,
-                    "Count": stats["questions_by_type"][qtype],
-                    "Points": stats["points_by_type"].get(qtype, 0)
-                })
-            df_types = pd.DataFrame(type_data)
             st.dataframe(df_types, use_container_width=True, hide_index=True)
             
             # Breakdown by Bloom
             st.markdown("##### By Bloom Level")
-            bloom_data = []
-            for bloom in sorted(stats["questions_by_bloom"].keys()):
-                bloom_data.append({
-                    "Bloom Level": bloom,
-                    "Count": stats["questions_by_bloom"][bloom],
-                    "Points": stats["points_by_bloom"].get(bloom, 0)
-                })
-            df_bloom = pd.DataFrame(bloom_data)
             st.dataframe(df_bloom, use_container_width=True, hide_index=True)
             
             # Preview/Edit questions
@@ -1518,12 +1779,39 @@ with assess_tabs[4]:
                     key="preview_slider"
                 )
             
-            # Editable question cards
-            for i, q in enumerate(tqs[:preview_choice]):
+            # Bulk regeneration: similar questions share one Gemini call
+            selected_for_regen = st.multiselect(
+                "Select questions to regenerate together",
+                options=list(range(total_questions)),
+                format_func=lambda idx: f"Q{tqs[idx]['question_number']}",
+                key="regen_selected_questions"
+            )
+            if selected_for_regen and st.button(
+                f"🔄 Regenerate selected ({len(selected_for_regen)})",
+                key="btn_regenerate_selected"
+            ):
+                api_key = get_gemini_api_key()
+                
+                if not api_key:
+                    st.error("❌ GEMINI_API_KEY is not configured.")
+                else:
+                    with st.spinner(f"Regenerating {len(selected_for_regen)} question(s)..."):
+                        result = regenerate_selected_questions(selected_for_regen, api_key)
+                    if result["failed"]:
+                        st.warning(f"⚠️ Regenerated {len(result['regenerated'])} question(s); {len(result['failed'])} failed.")
+                    if result["regenerated"]:
+                        del ss["regen_selected_questions"]
+                        st.rerun()
+            
+            # Editable question cards. Each card is a fragment: submitting one
+            # card's form reruns that card only, not every previewed question.
+            @st.fragment
+            def _render_question_card(i, q):
                 question_idx = i  # Store index for callbacks
+                q_type = q['type']
                 
                 with st.expander(
-                    f"Q{q['question_number']}: {q.get('type', q.get('question_type', 'MCQ'))} ({q['points']} pts) - {q.get('outcome_text', q.get('learning_outcome', 'N/A'))[:40]}...",
+                    f"Q{q['question_number']}: {q['type']} ({q['points']} pts) - {q['outcome_text'][:40]}...",
                     expanded=(i == 0)
                 ):
                     # Create a form for each question
@@ -1533,7 +1821,7 @@ with assess_tabs[4]:
                         # Outcome (read-only)
                         st.text_input(
                             "Learning Outcome",
-                            value=q.get('outcome_text', q.get('learning_outcome', 'N/A')),
+                            value=q['outcome_text'],
                             disabled=True,
                             key=f"outcome_{q['question_number']}"
                         )
@@ -1541,10 +1829,8 @@ with assess_tabs[4]:
                         # Editable fields in columns
                         col1, col2 = st.columns(2)
                         with col1:
-                            bloom_options = ["Remember", "Understand", "Apply", "Analyze", "Evaluate", "Create"]
-                            current_bloom = q.get('bloom', q.get('bloom_level', 'Remember'))
-                            if current_bloom not in bloom_options:
-                                bloom_options.append(current_bloom)
+                            current_bloom = q['bloom']
+                            bloom_options = BLOOMS if current_bloom in BLOOMS else BLOOMS + (current_bloom,)
                             
                             new_bloom = st.selectbox(
                                 "Bloom Level",
@@ -1572,7 +1858,7 @@ with assess_tabs[4]:
                         )
                         
                         # Type-specific fields
-                        if q.get('type', q.get('question_type')) == 'MCQ':
+                        if q_type == 'MCQ':
                             st.markdown("**Choices:**")
                             choices = q.get('choices', ['', '', '', ''])
                             new_choices = []
@@ -1599,7 +1885,7 @@ with assess_tabs[4]:
                                 key=f"answer_{q['question_number']}"
                             )
                         
-                        elif q.get('type', q.get('question_type')) == 'Short Answer':
+                        elif q_type == 'Short Answer':
                             new_answer_key = st.text_area(
                                 "Expected Answer / Answer Key",
                                 value=q.get('answer_key', ''),
@@ -1647,10 +1933,10 @@ with assess_tabs[4]:
                             }
                             
                             # Add type-specific updates
-                            if q.get('type', q.get('question_type')) == 'MCQ':
+                            if q_type == 'MCQ':
                                 updated_data['choices'] = new_choices
                                 updated_data['correct_answer'] = new_correct_answer
-                            elif q.get('type', q.get('question_type')) == 'Short Answer':
+                            elif q_type == 'Short Answer':
                                 updated_data['answer_key'] = new_answer_key
                             else:
                                 updated_data['sample_answer'] = new_sample_answer
@@ -1682,48 +1968,52 @@ with assess_tabs[4]:
                                 st.rerun()
                             else:
                                 st.error("❌ Failed to delete question.")
+            
+            for i, q in enumerate(tqs[:preview_choice]):
+                _render_question_card(i, q)
 
 # --- Export ---
 with assess_tabs[5]:
         st.markdown("### Export")
         
-        # Display current TOS settings
-        if "generated_tos" in st.session_state:
+        # ======================================================
+        # TOS EXPORT
+        # ======================================================
+        # Everything below is gated on session state; files are only built
+        # inside the export button branches, never on unrelated reruns.
+        if "generated_tos" in ss:
+            # Display current TOS settings
+            course_details = ss.course_details
             st.markdown("#### 📄 Course Configuration")
             col1, col2 = st.columns(2)
             with col1:
-                st.write(f"**Course:** {st.session_state.course_details.get('course_code', '')} - {st.session_state.course_details.get('course_title', '')}")
-                st.write(f"**Exam Term:** {st.session_state.course_details.get('exam_term', 'Midterm')}")
+                st.write(f"**Course:** {course_details.get('course_code', '')} - {course_details.get('course_title', '')}")
+                st.write(f"**Exam Term:** {course_details.get('exam_term', 'Midterm')}")
             with col2:
-                st.write(f"**Instructor:** {st.session_state.course_details.get('instructor', 'N/A')}")
-                st.write(f"**Academic Year:** {st.session_state.course_details.get('academic_year', '')}")
-
-        # ======================================================
-        # TOS EXPORT
-        # ======================================================
-        if "generated_tos" in st.session_state:
-            # Display question type distribution summary
-            if "question_types" in st.session_state.generated_tos:
-                st.markdown("#### 📊 Question Type Distribution Summary")
-                qt_summary = format_question_types_for_display(
-                    st.session_state.generated_tos["question_types"]
-                )
-                df_qt = pd.DataFrame(qt_summary)
-                st.dataframe(df_qt, use_container_width=True, hide_index=True)
+                st.write(f"**Instructor:** {course_details.get('instructor', 'N/A')}")
+                st.write(f"**Academic Year:** {course_details.get('academic_year', '')}")
+            
+            # Question type distribution summary (collapsed; table is cached)
+            if "question_types" in ss.generated_tos:
+                with st.expander("📊 Question Type Distribution Summary", expanded=False):
+                    df_qt = cached_question_types_summary_df(
+                        question_types_key(ss.generated_tos["question_types"])
+                    )
+                    st.dataframe(df_qt, use_container_width=True, hide_index=True)
             
             st.markdown("#### 📥 Export TOS")
             if st.button("⬇ Export TOS as Excel", key="btn_export_tos"):
 
-                exam_term = st.session_state.course_details.get("exam_term", "Midterm")
-                course_code = st.session_state.course_details.get("course_code", "")
-                course_title = st.session_state.course_details.get("course_title", "")
-                semester = st.session_state.course_details.get("semester", "")
-                instructor = st.session_state.course_details.get("instructor", "")
-                academic_year = st.session_state.course_details.get("academic_year", "")
+                exam_term = ss.course_details.get("exam_term", "Midterm")
+                course_code = ss.course_details.get("course_code", "")
+                course_title = ss.course_details.get("course_title", "")
+                semester = ss.course_details.get("semester", "")
+                instructor = ss.course_details.get("instructor", "")
+                academic_year = ss.course_details.get("academic_year", "")
                 
                 # Get total points from generated TOS
                 # This comes from compute_question_type_totals() - the SINGLE SOURCE OF TRUTH
-                total_points = st.session_state.generated_tos.get("total_points", 0)
+                total_points = ss.generated_tos.get("total_points", 0)
 
                 excel = export_tos_exact_format(
                     meta={
@@ -1738,9 +2028,9 @@ with assess_tabs[5]:
                         "exam_date": "",
                         "course_content": ""
                     },
-                    outcomes=st.session_state.generated_tos["outcomes"],
-                    tos_matrix=st.session_state.generated_tos["tos_matrix"],
-                    total_items=st.session_state.generated_tos.get("total_items", 0),
+                    outcomes=ss.generated_tos["outcomes"],
+                    tos_matrix=ss.generated_tos["tos_matrix"],
+                    total_items=ss.generated_tos.get("total_items", 0),
                     total_points=int(total_points)  # From SINGLE SOURCE OF TRUTH
                 )
 
@@ -1759,15 +2049,15 @@ with assess_tabs[5]:
         # ======================================================
         # TQS EXPORT
         # ======================================================
-        if "generated_tqs" in st.session_state and st.session_state.generated_tqs:
+        if "generated_tqs" in ss and ss.generated_tqs:
             st.markdown("#### 📥 Export Test Questions")
             st.markdown("Export your finalized questions to various formats:")
             
             # Get course details for export
-            exam_term = st.session_state.course_details.get("exam_term", "Midterm")
-            course_code = st.session_state.course_details.get("course_code", "")
-            course_name = st.session_state.course_details.get("course_name", "Course Name")
-            instructor_name = st.session_state.course_details.get("instructor_name", "")
+            exam_term = ss.course_details.get("exam_term", "Midterm")
+            course_code = ss.course_details.get("course_code", "")
+            course_name = ss.course_details.get("course_name", "Course Name")
+            instructor_name = ss.course_details.get("instructor_name", "")
             
             # Export Options
             st.markdown("##### Export Options")
@@ -1803,7 +2093,7 @@ with assess_tabs[5]:
                     try:
                         with st.spinner("Generating DOCX file..."):
                             docx_buffer = tqs_export_service.export_to_docx(
-                                questions=st.session_state.generated_tqs,
+                                questions=ss.generated_tqs,
                                 course_name=course_name,
                                 exam_title=f"{course_code} {exam_term} Exam",
                                 exam_term=exam_term,
@@ -1835,7 +2125,7 @@ with assess_tabs[5]:
                     try:
                         with st.spinner("Generating PDF file..."):
                             pdf_buffer = tqs_export_service.export_to_pdf(
-                                questions=st.session_state.generated_tqs,
+                                questions=ss.generated_tqs,
                                 course_name=course_name,
                                 exam_title=f"{course_code} {exam_term} Exam",
                                 exam_term=exam_term,
@@ -1867,7 +2157,7 @@ with assess_tabs[5]:
                     try:
                         with st.spinner("Generating CSV file..."):
                             csv_buffer = tqs_export_service.export_to_csv(
-                                questions=st.session_state.generated_tqs
+                                questions=ss.generated_tqs
                             )
                             
                             file_name = f"TQS_{course_code}_{exam_term}.csv"
@@ -1885,7 +2175,7 @@ with assess_tabs[5]:
             with col4:
                 # Export to JSON (original functionality preserved)
                 if st.button("📋 Export to JSON", use_container_width=True, key="btn_export_json"):
-                    tqs_json = json.dumps(st.session_state.generated_tqs, indent=2)
+                    tqs_json = tqs_json_bytes(ss.generated_tqs)
                     
                     file_name = f"TQS_{course_code}_{exam_term}.json"
                     st.download_button(
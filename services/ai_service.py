@@ -17,12 +17,35 @@ Features:
 4. Error Handling: Graceful fallbacks and detailed error reporting
 """
 
+import concurrent.futures
+import hashlib
+import itertools
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Iterator
 import google.genai as genai  # Using official google-genai package (google.generativeai is deprecated)
-from jsonschema import validate, ValidationError, FormatChecker
-import re
+from google.genai import errors as genai_errors
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+    before_sleep_log
+)
+from jsonschema import ValidationError, FormatChecker
+from jsonschema.validators import validator_for
+from services.tqs_service import get_gemini_client, find_json_object, hash_api_key
+
+# Optional: orjson for faster JSON parsing/serialization (falls back to stdlib)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -79,7 +102,9 @@ TEST_QUESTION_SCHEMA = {
                     "difficulty": {
                         "type": "string",
                         "enum": ["Easy", "Medium", "Hard"]
-                    }
+                    },
+                    # System-added after generation (index of answer in choices)
+                    "answer_idx": {"type": "integer", "minimum": 0, "maximum": 3}
                 },
                 "required": ["type", "question", "choices", "answer", "difficulty"],
                 "additionalProperties": False
@@ -90,10 +115,24 @@ TEST_QUESTION_SCHEMA = {
     "additionalProperties": False
 }
 
+
+def _compile_validator(schema: Dict[str, Any]):
+    """Build a reusable validator so the schema is only processed once."""
+    return validator_for(schema)(schema, format_checker=FormatChecker())
+
+
+BLOOM_VALIDATOR = _compile_validator(BLOOM_CLASSIFICATION_SCHEMA)
+TEST_QUESTION_VALIDATOR = _compile_validator(TEST_QUESTION_SCHEMA)
+TEST_QUESTION_ITEM_VALIDATOR = _compile_validator(
+    TEST_QUESTION_SCHEMA["properties"]["questions"]["items"]
+)
+
 # ============================================================================
 # GEMINI API CONFIGURATION
 # ============================================================================
 
+GEMINI_MODEL = "gemini-2.0-flash"
+
 class GeminiConfig:
     """Manages Gemini API configuration and initialization using google-genai."""
     
@@ -102,8 +141,8 @@ class GeminiConfig:
         if not api_key:
             raise ValueError("GEMINI_API_KEY environment variable is not set")
         
-        # Create Gemini client using google-genai (official package)
-        self.client = genai.Client(api_key=api_key)
+        # Shared google-genai client per key (keeps its connection pool across calls)
+        self.client = get_gemini_client(api_key)
         self.api_key = api_key
         logger.info("✓ Gemini API (google-genai) configured successfully")
     
@@ -117,10 +156,51 @@ class GeminiConfig:
         return self.client.models
 
 
+# ============================================================================
+# RETRY POLICY - Transient Gemini Failures
+# ============================================================================
+
+def _is_transient_gemini_error(exc: BaseException) -> bool:
+    """True for errors worth retrying: 5xx server errors and 429 rate limits."""
+    if isinstance(exc, genai_errors.ServerError):
+        return True
+    return isinstance(exc, genai_errors.ClientError) and getattr(exc, "code", None) == 429
+
+
+# Up to 6 attempts with jittered exponential backoff (1s, 2s, 4s ... capped at 32s)
+_gemini_retry = retry(
+    retry=retry_if_exception(_is_transient_gemini_error),
+    wait=wait_exponential_jitter(initial=1, max=32),
+    stop=stop_after_attempt(6),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True
+)
+
+
+@_gemini_retry
+def _generate_content(model, prompt: str):
+    """Call Gemini generate_content, retrying transient failures."""
+    return model.generate_content(model=GEMINI_MODEL, contents=prompt)
+
+
 # ============================================================================
 # HELPER FUNCTIONS - JSON EXTRACTION & VALIDATION
 # ============================================================================
 
+def _json_loads(data):
+    """Parse JSON with orjson when available, else the stdlib json module."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
 def extract_json_from_response(text: str) -> Dict[str, Any]:
     """
     Extract JSON object from Gemini response.
@@ -135,46 +215,21 @@ def extract_json_from_response(text: str) -> Dict[str, Any]:
     Raises:
         ValueError: If no valid JSON found in response
     """
-    # Try to find JSON in code blocks
-    code_block_pattern = r"```(?:json)?\s*(\{.*?\})\s*```"
-    match = re.search(code_block_pattern, text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
-            pass
-    
-    # Try to extract JSON object directly
-    brace_start = text.find('{')
-    if brace_start != -1:
-        brace_count = 0
-        brace_end = -1
-        for i in range(brace_start, len(text)):
-            if text[i] == '{':
-                brace_count += 1
-            elif text[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    brace_end = i + 1
-                    break
-        
-        if brace_end > 0:
-            try:
-                return json.loads(text[brace_start:brace_end])
-            except json.JSONDecodeError:
-                pass
+    data = find_json_object(text, loads=_json_loads)
+    if data is not None:
+        return data
     
     raise ValueError(f"Could not extract valid JSON from Gemini response: {text[:200]}")
 
 
-def validate_json_response(data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
+def validate_json_response(data: Dict[str, Any], validator) -> bool:
     """
     Validate JSON response against schema.
     System-controlled validation before any data is processed.
     
     Args:
         data: JSON object to validate
-        schema: JSON schema to validate against
+        validator: Precompiled validator (e.g. BLOOM_VALIDATOR)
         
     Returns:
         True if valid
@@ -183,7 +238,7 @@ def validate_json_response(data: Dict[str, Any], schema: Dict[str, Any]) -> bool
         ValidationError: If validation fails
     """
     try:
-        validate(instance=data, schema=schema, format_checker=FormatChecker())
+        validator.validate(data)
         logger.info("✓ JSON validation passed")
         return True
     except ValidationError as e:
@@ -195,44 +250,11 @@ def validate_json_response(data: Dict[str, Any], schema: Dict[str, Any]) -> bool
 # BLOOM CLASSIFICATION FUNCTION
 # ============================================================================
 
-def classify_competencies_bloom(
+def _classify_competencies_uncached(
     competencies: List[str],
     api_key: str
 ) -> Dict[str, Any]:
-    """
-    Classify learning competencies into Bloom's Taxonomy levels using Gemini.
-    
-    INPUT:
-    - competencies: List of learning competency strings
-      Example: ["Identify the parts of a cell", "Design a new experiment"]
-    
-    OUTPUT:
-    {
-        "competencies": [
-            {
-                "text": "Original competency text",
-                "bloom_level": "Remember|Understand|Apply|Analyze|Evaluate|Create",
-                "justification": "Brief explanation of classification"
-            },
-            ...
-        ]
-    }
-    
-    SYSTEM CONTROL:
-    - Output strictly follows JSON schema
-    - Gemini cannot override or modify competency text
-    - System validates before returning
-    
-    Args:
-        competencies: List of competency strings to classify
-        api_key: Gemini API key
-        
-    Returns:
-        Validated JSON with Bloom classifications
-        
-    Raises:
-        ValueError: If Gemini response cannot be parsed or validated
-    """
+    """Call Gemini and validate a Bloom classification (no caching)."""
     logger.info(f"Classifying {len(competencies)} competencies to Bloom levels")
     
     # Initialize Gemini (can be reused)
@@ -272,7 +294,7 @@ OUTPUT FORMAT (STRICT JSON):
     
     try:
         # Call Gemini
-        response = model.generate_content(prompt)
+        response = _generate_content(model, prompt)
         logger.info("✓ Received response from Gemini")
         
         # Extract JSON from response
@@ -280,7 +302,7 @@ OUTPUT FORMAT (STRICT JSON):
         logger.info("✓ Extracted JSON from response")
         
         # Validate against schema
-        validate_json_response(parsed_json, BLOOM_CLASSIFICATION_SCHEMA)
+        validate_json_response(parsed_json, BLOOM_VALIDATOR)
         
         # Verify text integrity (Gemini must not modify original text)
         for i, item in enumerate(parsed_json["competencies"]):
@@ -301,68 +323,272 @@ OUTPUT FORMAT (STRICT JSON):
         raise
 
 
+
+# In-process memo of classification results (JSON strings), least recently
+# used first. Keyed on the normalized chunk plus a digest of the API key, so
+# the raw key is never stored.
+CLASSIFICATION_MEMO_SIZE = 1024
+_classification_memo: "OrderedDict[tuple, str]" = OrderedDict()
+_classification_memo_lock = threading.Lock()
+
+
 # ============================================================================
-# TEST QUESTION GENERATION FUNCTION
+# PERSISTENT CLASSIFICATION CACHE (SQLite)
 # ============================================================================
 
-def generate_test_questions(
-    competency: str,
-    bloom_level: str,
-    num_items: int,
-    api_key: str,
-    subject: str = "",
-    context: str = ""
+# Survives server restarts and is shared by every Streamlit worker on the host
+CLASSIFICATION_CACHE_PATH = os.environ.get(
+    "GEMINI_CACHE_PATH", os.path.join(".gemini_cache", "classifications.sqlite3")
+)
+CLASSIFICATION_CACHE_TTL = 7 * 86400  # 7 days
+CLASSIFICATION_MODEL = GEMINI_MODEL
+CLASSIFICATION_CACHE_VERSION = 1  # Bump when the prompt or schema changes
+CLASSIFICATION_CHUNK_SIZE = 25  # Competencies per Gemini request (token budget)
+
+_disk_cache_lock = threading.Lock()
+
+
+def _disk_cache_connect() -> sqlite3.Connection:
+    """Open the cache database, creating it on first use."""
+    directory = os.path.dirname(CLASSIFICATION_CACHE_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(CLASSIFICATION_CACHE_PATH, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cache ("
+        "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+    )
+    return conn
+
+
+def _classification_cache_key(competencies: tuple) -> str:
+    """Stable key over the competencies, model and prompt version."""
+    payload = json.dumps(
+        {"c": list(competencies), "m": CLASSIFICATION_MODEL, "v": CLASSIFICATION_CACHE_VERSION}
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _disk_cache_get(key: str) -> Optional[str]:
+    """Return a cached JSON string, or None on miss/expiry/cache error."""
+    try:
+        with _disk_cache_lock:
+            conn = _disk_cache_connect()
+            try:
+                row = conn.execute(
+                    "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+            finally:
+                conn.close()
+        return row[0] if row else None
+    except sqlite3.Error as e:
+        logger.warning(f"Classification disk cache read failed: {e}")
+        return None
+
+
+def _disk_cache_set(key: str, value: str, expire: int = CLASSIFICATION_CACHE_TTL) -> None:
+    """Store a JSON string; cache errors are logged, never raised."""
+    try:
+        with _disk_cache_lock:
+            conn = _disk_cache_connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, value, time.time() + expire)
+                    )
+                    conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            finally:
+                conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Classification disk cache write failed: {e}")
+
+
+# In-flight classification requests, so concurrent identical misses share one call
+_inflight: Dict[str, concurrent.futures.Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _coalesce(key: str, fn, *args):
+    """
+    Run fn(*args) once per key at a time.
+    
+    The first caller executes fn; callers arriving while it is still running
+    block on the same Future and receive its result (or exception).
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = _inflight[key] = concurrent.futures.Future()
+    
+    if not is_owner:
+        logger.info("Joining in-flight Bloom classification request")
+        return future.result()
+    
+    try:
+        result = fn(*args)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _normalize_competencies(competencies) -> tuple:
+    """Cache-key form of a competency list (stripped, lower-cased)."""
+    return tuple(c.strip().lower() for c in competencies)
+
+
+def _classify_cached(competencies: tuple, api_key: str) -> str:
+    """
+    Memoized Bloom classification.
+    
+    The memo is keyed on the normalized text, but a miss sends the caller's
+    original wording to Gemini. Returns the validated result as a JSON
+    string so callers always receive a fresh copy and cannot mutate the
+    cached value.
+    """
+    normalized = _normalize_competencies(competencies)
+    memo_key = (normalized, hash_api_key(api_key))
+    with _classification_memo_lock:
+        result = _classification_memo.get(memo_key)
+        if result is not None:
+            _classification_memo.move_to_end(memo_key)
+            return result
+    
+    disk_key = _classification_cache_key(normalized)
+    result = _disk_cache_get(disk_key)
+    if result is not None:
+        logger.info("✓ Bloom classification served from disk cache")
+    else:
+        result = _coalesce(disk_key, _classify_and_store, competencies, api_key, disk_key)
+    
+    with _classification_memo_lock:
+        _classification_memo[memo_key] = result
+        if len(_classification_memo) > CLASSIFICATION_MEMO_SIZE:
+            _classification_memo.popitem(last=False)
+    return result
+
+
+def _classify_and_store(competencies: tuple, api_key: str, disk_key: str) -> str:
+    """Classify via Gemini and persist the JSON result to the disk cache."""
+    result = _json_dumps(_classify_competencies_uncached(list(competencies), api_key))
+    _disk_cache_set(disk_key, result)
+    return result
+
+
+def is_classification_cached(competencies: List[str]) -> bool:
+    """
+    Return True if every chunk of competencies is already in the disk cache.
+    
+    Lets the UI skip progress indicators for calls that will return instantly.
+    """
+    normalized = (c.strip().lower() for c in competencies)
+    while True:
+        chunk = tuple(itertools.islice(normalized, CLASSIFICATION_CHUNK_SIZE))
+        if not chunk:
+            return True
+        if _disk_cache_get(_classification_cache_key(chunk)) is None:
+            return False
+
+
+def clear_classification_cache() -> None:
+    """Drop all memoized Bloom classifications (in-process and on disk)."""
+    with _classification_memo_lock:
+        _classification_memo.clear()
+    try:
+        with _disk_cache_lock:
+            conn = _disk_cache_connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM cache")
+            finally:
+                conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Classification disk cache clear failed: {e}")
+    logger.info("✓ Bloom classification cache cleared")
+
+
+def classify_competencies_bloom(
+    competencies: List[str],
+    api_key: str
 ) -> Dict[str, Any]:
     """
-    Generate multiple-choice test questions for a specific competency using Gemini.
+    Classify learning competencies into Bloom's Taxonomy levels using Gemini.
     
     INPUT:
-    - competency: The learning competency (e.g., "Identify the parts of a cell")
-    - bloom_level: Bloom's level (Remember, Understand, Apply, Analyze, Evaluate, Create)
-    - num_items: Number of questions to generate
-    - subject: Optional subject context (e.g., "Biology")
-    - context: Optional additional context (e.g., "High School Level")
+    - competencies: List of learning competency strings
+      Example: ["Identify the parts of a cell", "Design a new experiment"]
     
     OUTPUT:
     {
-        "questions": [
+        "competencies": [
             {
-                "type": "MCQ",
-                "question": "Question text",
-                "choices": ["A", "B", "C", "D"],
-                "answer": "Correct answer letter",
-                "difficulty": "Easy/Medium/Hard"
+                "text": "Original competency text",
+                "bloom_level": "Remember|Understand|Apply|Analyze|Evaluate|Create",
+                "justification": "Brief explanation of classification"
             },
             ...
         ]
     }
     
     SYSTEM CONTROL:
-    - Number of items matches requested count
-    - Bloom level constraints enforced by system
-    - Difficulty distribution determined by system validation
-    - Gemini cannot override question count
+    - Output strictly follows JSON schema
+    - Gemini cannot override or modify competency text
+    - System validates before returning
+    
+    Results are memoized per normalized (stripped, lower-cased) competency
+    list, in process and in a SQLite cache on disk (7-day expiry), while
+    Gemini always receives the original wording; call
+    clear_classification_cache() to force fresh classifications. Large
+    lists are sent in chunks of CLASSIFICATION_CHUNK_SIZE competencies per
+    request.
     
     Args:
-        competency: The learning competency to base questions on
-        bloom_level: Bloom's taxonomy level
-        num_items: Number of questions to generate
+        competencies: List of competency strings to classify
         api_key: Gemini API key
-        subject: Optional subject context
-        context: Optional additional context
         
     Returns:
-        Validated JSON with test questions
+        Validated JSON with Bloom classifications
         
     Raises:
         ValueError: If Gemini response cannot be parsed or validated
     """
-    logger.info(f"Generating {num_items} questions for: {competency} ({bloom_level})")
+    # One Gemini request per chunk of competencies rather than one per item
+    result = {"competencies": []}
+    remaining = iter(competencies)
+    while True:
+        chunk = tuple(itertools.islice(remaining, CLASSIFICATION_CHUNK_SIZE))
+        if not chunk:
+            break
+        result["competencies"].extend(
+            _json_loads(_classify_cached(chunk, api_key))["competencies"]
+        )
     
-    # Initialize Gemini
-    config = GeminiConfig(api_key)
-    model = config.get_model()
+    # Cache hits may carry another caller's wording; hand back this caller's
+    for item, original in zip(result["competencies"], competencies):
+        item["text"] = original
     
+    return result
+
+
+# ============================================================================
+# TEST QUESTION GENERATION FUNCTION
+# ============================================================================
+
+def _build_test_question_prompt(
+    competency: str,
+    bloom_level: str,
+    num_items: int,
+    subject: str = "",
+    context: str = ""
+) -> str:
+    """Build the strict-JSON prompt used for MCQ generation."""
     # Build context string
     context_str = ""
     if subject:
@@ -416,38 +642,123 @@ OUTPUT FORMAT (STRICT JSON):
     ]
 }}"""
     
+    return prompt
+
+
+def _answer_index(answer: str) -> Optional[int]:
+    """Choice index (0-3) for an answer letter A-D, or None if it isn't one."""
+    if len(answer) == 1 and "A" <= answer <= "D":
+        return ord(answer) - ord("A")
+    return None
+
+
+def _finalize_test_questions(parsed_json: Dict[str, Any], num_items: int) -> Dict[str, Any]:
+    """
+    Apply schema validation and system controls to a generated question set.
+    
+    Raises:
+        ValueError: If any question has an invalid answer or choice count
+    """
+    # Validate against schema
+    validate_json_response(parsed_json, TEST_QUESTION_VALIDATOR)
+    
+    # System control: Verify question count matches requested
+    question_count = len(parsed_json["questions"])
+    if question_count != num_items:
+        logger.warning(
+            f"Generated {question_count} questions, but {num_items} were requested. "
+            f"System will adjust."
+        )
+        # System-controlled adjustment: keep only requested number
+        parsed_json["questions"] = parsed_json["questions"][:num_items]
+    
+    # Validate answer choices match provided choices
+    for i, q in enumerate(parsed_json["questions"]):
+        if q["answer"] not in ["A", "B", "C", "D"]:
+            logger.error(f"Invalid answer '{q['answer']}' in question {i+1}")
+            raise ValueError(f"Question {i+1} has invalid answer format")
+        if len(q["choices"]) != 4:
+            logger.error(f"Question {i+1} does not have exactly 4 choices")
+            raise ValueError(f"Question {i+1} must have exactly 4 choices")
+        # Precompute the choice index so UIs don't redo the letter arithmetic
+        q["answer_idx"] = _answer_index(q["answer"])
+    
+    return parsed_json
+
+
+def generate_test_questions(
+    competency: str,
+    bloom_level: str,
+    num_items: int,
+    api_key: str,
+    subject: str = "",
+    context: str = ""
+) -> Dict[str, Any]:
+    """
+    Generate multiple-choice test questions for a specific competency using Gemini.
+    
+    INPUT:
+    - competency: The learning competency (e.g., "Identify the parts of a cell")
+    - bloom_level: Bloom's level (Remember, Understand, Apply, Analyze, Evaluate, Create)
+    - num_items: Number of questions to generate
+    - subject: Optional subject context (e.g., "Biology")
+    - context: Optional additional context (e.g., "High School Level")
+    
+    OUTPUT:
+    {
+        "questions": [
+            {
+                "type": "MCQ",
+                "question": "Question text",
+                "choices": ["A", "B", "C", "D"],
+                "answer": "Correct answer letter",
+                "difficulty": "Easy/Medium/Hard",
+                "answer_idx": 0  # index of the answer in choices (system-added)
+            },
+            ...
+        ]
+    }
+    
+    SYSTEM CONTROL:
+    - Number of items matches requested count
+    - Bloom level constraints enforced by system
+    - Difficulty distribution determined by system validation
+    - Gemini cannot override question count
+    
+    Args:
+        competency: The learning competency to base questions on
+        bloom_level: Bloom's taxonomy level
+        num_items: Number of questions to generate
+        api_key: Gemini API key
+        subject: Optional subject context
+        context: Optional additional context
+        
+    Returns:
+        Validated JSON with test questions
+        
+    Raises:
+        ValueError: If Gemini response cannot be parsed or validated
+    """
+    logger.info(f"Generating {num_items} questions for: {competency} ({bloom_level})")
+    
+    # Initialize Gemini
+    config = GeminiConfig(api_key)
+    model = config.get_model()
+    
+    prompt = _build_test_question_prompt(competency, bloom_level, num_items, subject, context)
+    
     try:
         # Call Gemini
-        response = model.generate_content(prompt)
+        response = _generate_content(model, prompt)
         logger.info("✓ Received response from Gemini")
         
         # Extract JSON
         parsed_json = extract_json_from_response(response.text)
         logger.info("✓ Extracted JSON from response")
         
-        # Validate against schema
-        validate_json_response(parsed_json, TEST_QUESTION_SCHEMA)
-        
-        # System control: Verify question count matches requested
-        question_count = len(parsed_json["questions"])
-        if question_count != num_items:
-            logger.warning(
-                f"Generated {question_count} questions, but {num_items} were requested. "
-                f"System will adjust."
-            )
-            # System-controlled adjustment: keep only requested number
-            parsed_json["questions"] = parsed_json["questions"][:num_items]
+        parsed_json = _finalize_test_questions(parsed_json, num_items)
         
-        # Validate answer choices match provided choices
-        for i, q in enumerate(parsed_json["questions"]):
-            if q["answer"] not in ["A", "B", "C", "D"]:
-                logger.error(f"Invalid answer '{q['answer']}' in question {i+1}")
-                raise ValueError(f"Question {i+1} has invalid answer format")
-            if len(q["choices"]) != 4:
-                logger.error(f"Question {i+1} does not have exactly 4 choices")
-                raise ValueError(f"Question {i+1} must have exactly 4 choices")
-        
-        logger.info(f"✓ Test question generation completed: {question_count} questions")
+        logger.info(f"✓ Test question generation completed: {len(parsed_json['questions'])} questions")
         return parsed_json
         
     except Exception as e:
@@ -455,10 +766,200 @@ OUTPUT FORMAT (STRICT JSON):
         raise
 
 
+class _StreamingQuestionParser:
+    """
+    Incremental parser for a streamed {"questions": [ {...}, ... ]} payload.
+    
+    Feed raw text chunks; each call returns the question objects completed
+    by that chunk. Bracket/string state is carried across chunks, so every
+    character is scanned once and only the object currently being built is
+    held in memory (not the whole response).
+    """
+    
+    def __init__(self):
+        self._prefix = ""          # Text seen before the questions array opens
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._current = []         # Characters of the object being built
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk and return any newly completed question dicts."""
+        if self._done:
+            return []
+        
+        if not self._in_array:
+            self._prefix += chunk
+            key_pos = self._prefix.find('"questions"')
+            if key_pos == -1:
+                return []
+            array_start = self._prefix.find("[", key_pos)
+            if array_start == -1:
+                return []
+            chunk = self._prefix[array_start + 1:]
+            self._prefix = ""
+            self._in_array = True
+        
+        completed = []
+        current = self._current
+        for ch in chunk:
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    current.append(ch)
+                elif ch == "]":
+                    self._done = True
+                    break
+                continue
+            
+            current.append(ch)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.append(_json_loads("".join(current)))
+                    current.clear()
+        
+        return completed
+    
+    @property
+    def found_array(self) -> bool:
+        """True once the questions array has been located in the stream."""
+        return self._in_array
+
+
+def stream_test_questions(
+    competency: str,
+    bloom_level: str,
+    num_items: int,
+    api_key: str,
+    subject: str = "",
+    context: str = ""
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant of generate_test_questions.
+    
+    Yields each question dict as soon as its JSON object has fully arrived,
+    so the UI can render the first question long before Gemini finishes.
+    Each question is schema-validated as it completes (raising early on the
+    first malformed item); once the stream ends, the collected set goes
+    through the same system controls as generate_test_questions. Memory is
+    bounded by the questions kept, not the raw response text.
+    
+    Args:
+        competency: The learning competency to base questions on
+        bloom_level: Bloom's taxonomy level
+        num_items: Number of questions to generate
+        api_key: Gemini API key
+        subject: Optional subject context
+        context: Optional additional context
+        
+    Yields:
+        Question dicts (type, question, choices, answer, difficulty, answer_idx)
+    """
+    logger.info(f"Streaming {num_items} questions for: {competency} ({bloom_level})")
+    
+    config = GeminiConfig(api_key)
+    prompt = _build_test_question_prompt(competency, bloom_level, num_items, subject, context)
+    
+    parser = _StreamingQuestionParser()
+    questions = []
+    
+    try:
+        for chunk in config.get_client().models.generate_content_stream(
+            model=GEMINI_MODEL,
+            contents=prompt
+        ):
+            if not chunk.text:
+                continue
+            
+            for question in parser.feed(chunk.text):
+                if len(questions) >= num_items:
+                    continue
+                # Fail early on the first malformed question
+                TEST_QUESTION_ITEM_VALIDATOR.validate(question)
+                questions.append(question)
+                
+                streamed = dict(question)
+                answer_idx = _answer_index(streamed["answer"])
+                if answer_idx is not None:
+                    streamed["answer_idx"] = answer_idx
+                yield streamed
+        
+        logger.info("✓ Gemini stream completed")
+        
+        if not parser.found_array:
+            raise ValueError("Could not find a questions array in the Gemini stream")
+        
+        # System controls on the complete set (count, answers, choices)
+        parsed_json = _finalize_test_questions({"questions": questions}, num_items)
+        logger.info(f"✓ Streamed question generation completed: {len(parsed_json['questions'])} questions")
+        
+    except Exception as e:
+        logger.error(f"✗ Streamed question generation failed: {str(e)}")
+        raise
+
+
 # ============================================================================
 # BATCH PROCESSING (OPTIONAL)
 # ============================================================================
 
+# Maximum number of Gemini requests in flight during batch generation
+MAX_CONCURRENT_REQUESTS = 5
+
+
+def _generate_questions_concurrently(
+    jobs: List[Dict[str, Any]],
+    api_key: str,
+    subject: str,
+    context: str,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS
+) -> List[Any]:
+    """
+    Run generate_test_questions for every job concurrently.
+    
+    Each blocking Gemini call runs in a pool thread; the pool size caps how
+    many requests are in flight at once. No event loop is involved, so this
+    is safe to call from async code (e.g. FastAPI handlers).
+    
+    Args:
+        jobs: List of dicts with competency, bloom_level and num_items
+        api_key: Gemini API key
+        subject: Optional subject context
+        context: Optional additional context
+        max_concurrency: Maximum simultaneous Gemini requests
+        
+    Returns:
+        Results in the same order as jobs (exceptions are returned, not raised)
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        futures = [
+            pool.submit(
+                generate_test_questions,
+                competency=job["competency"],
+                bloom_level=job["bloom_level"],
+                num_items=job["num_items"],
+                api_key=api_key,
+                subject=subject,
+                context=context
+            )
+            for job in jobs
+        ]
+    return [future.exception() or future.result() for future in futures]
+
+
 def batch_classify_and_generate(
     competencies: List[str],
     bloom_weights: Dict[str, int],
@@ -474,6 +975,10 @@ def batch_classify_and_generate(
     1. Classifies competencies to Bloom levels
     2. Generates questions based on Bloom distribution and total items
     
+    Question generation for all competencies is dispatched concurrently
+    (at most MAX_CONCURRENT_REQUESTS at a time), so wall time is close to
+    a single Gemini round-trip instead of one per competency.
+    
     Args:
         competencies: List of competencies
         bloom_weights: Dict with Bloom level percentages (must total 100)
@@ -495,28 +1000,30 @@ def batch_classify_and_generate(
     items_per_competency = total_items // len(competencies)
     remainder = total_items % len(competencies)
     
-    all_questions = {}
-    
+    jobs = []
     for i, item in enumerate(classifications["competencies"]):
-        competency_text = item["text"]
-        bloom_level = item["bloom_level"]
-        
         # Distribute items: some get +1
         num_questions = items_per_competency + (1 if i < remainder else 0)
         
         if num_questions > 0:
-            logger.info(
-                f"Generating {num_questions} questions for competency: {competency_text[:50]}..."
-            )
-            questions = generate_test_questions(
-                competency=competency_text,
-                bloom_level=bloom_level,
-                num_items=num_questions,
-                api_key=api_key,
-                subject=subject,
-                context=context
+            jobs.append({
+                "competency": item["text"],
+                "bloom_level": item["bloom_level"],
+                "num_items": num_questions
+            })
+    
+    logger.info(f"Dispatching question generation for {len(jobs)} competencies")
+    results = _generate_questions_concurrently(jobs, api_key, subject, context)
+    
+    all_questions = {}
+    
+    for job, result in zip(jobs, results):
+        if isinstance(result, Exception):
+            logger.error(
+                f"✗ Question generation failed for competency: {job['competency'][:50]}... ({result})"
             )
-            all_questions[competency_text] = questions["questions"]
+            raise result
+        all_questions[job["competency"]] = result["questions"]
     
     logger.info("✓ Batch processing completed")
     
@@ -1,6 +1,14 @@
 import re
 from PyPDF2 import PdfReader
 import io
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+
+# Syllabus details and the learning-plan table sit in the first pages
+MAX_SYLLABUS_PAGES = 15
 
 
 def extract_syllabus_details(pdf_file, exam_term="Midterm"):
@@ -26,13 +34,12 @@ def extract_syllabus_details(pdf_file, exam_term="Midterm"):
     try:
         # Read PDF - LIMIT to first 15 pages to get full syllabus table
         pdf_reader = PdfReader(pdf_file)
-        pages_to_read = min(15, len(pdf_reader.pages))
-        text = ""
+        pages_to_read = min(MAX_SYLLABUS_PAGES, len(pdf_reader.pages))
         
-        for i in range(pages_to_read):
-            page_text = pdf_reader.pages[i].extract_text()
-            if page_text:
-                text += page_text + "\n"
+        # Pages share the reader's stream, so they are read in order on this
+        # thread; joining once avoids re-copying the text for every page
+        page_texts = (pdf_reader.pages[i].extract_text() for i in range(pages_to_read))
+        text = "".join(page_text + "\n" for page_text in page_texts if page_text)
         
         # Initialize result dictionary
         result = {
@@ -217,3 +224,89 @@ def extract_syllabus_details(pdf_file, exam_term="Midterm"):
             "learning_outcomes": []
         }
 
+
+# ======================================================
+# PERSISTENT EXTRACTION CACHE
+# ======================================================
+# Parsed syllabus details keyed by PDF content hash + exam term, stored in
+# SQLite so they survive app restarts. Bump SYLLABUS_CACHE_VERSION whenever
+# the extraction logic above changes.
+
+SYLLABUS_CACHE_PATH = os.environ.get(
+    "SYLLABUS_CACHE_PATH", os.path.join(".syllabus_cache", "syllabus.sqlite3")
+)
+SYLLABUS_CACHE_VERSION = 1
+
+_syllabus_cache_lock = threading.Lock()
+
+
+def _syllabus_cache_connect():
+    """Open the cache database, creating it on first use."""
+    directory = os.path.dirname(SYLLABUS_CACHE_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(SYLLABUS_CACHE_PATH, timeout=5)
+    conn.execute("CREATE TABLE IF NOT EXISTS syllabus (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    return conn
+
+
+def syllabus_cache_key(pdf_bytes, exam_term="Midterm"):
+    """Content-addressed cache key for a syllabus PDF and exam term."""
+    digest = hashlib.blake2b(pdf_bytes, digest_size=16)
+    digest.update(f"|{exam_term}|v{SYLLABUS_CACHE_VERSION}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def extract_syllabus_details_cached(pdf_bytes, exam_term="Midterm"):
+    """
+    Same as extract_syllabus_details, but takes raw PDF bytes and reuses the
+    parsed result from disk for any file that was processed before.
+    
+    Failed extractions are not cached; cache errors fall back to parsing.
+    """
+    key = syllabus_cache_key(pdf_bytes, exam_term)
+    
+    try:
+        with _syllabus_cache_lock:
+            conn = _syllabus_cache_connect()
+            try:
+                row = conn.execute("SELECT value FROM syllabus WHERE key = ?", (key,)).fetchone()
+            finally:
+                conn.close()
+        if row:
+            return json.loads(row[0])
+    except (sqlite3.Error, ValueError):
+        pass
+    
+    result = extract_syllabus_details(io.BytesIO(pdf_bytes), exam_term=exam_term)
+    
+    if "error" not in result:
+        try:
+            with _syllabus_cache_lock:
+                conn = _syllabus_cache_connect()
+                try:
+                    with conn:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO syllabus (key, value) VALUES (?, ?)",
+                            (key, json.dumps(result))
+                        )
+                finally:
+                    conn.close()
+        except sqlite3.Error:
+            pass
+    
+    return result
+
+
+def clear_syllabus_cache():
+    """Delete every cached extraction result. Returns the number of entries removed."""
+    try:
+        with _syllabus_cache_lock:
+            conn = _syllabus_cache_connect()
+            try:
+                with conn:
+                    return conn.execute("DELETE FROM syllabus").rowcount
+            finally:
+                conn.close()
+    except sqlite3.Error:
+        return 0
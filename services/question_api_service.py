@@ -8,12 +8,26 @@ Future: Can be converted to FastAPI/Flask endpoints for true REST API.
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+from itertools import islice
+from typing import Dict, List, Any, Optional, Iterator
 from datetime import datetime
-from services.tqs_service import generate_question_with_gemini, get_tqs_statistics
+from services.tqs_service import (
+    generate_question_with_gemini,
+    generate_batch_questions,
+    group_slots_by_characteristics,
+    split_large_batches,
+    get_tqs_statistics,
+)
 
 logger = logging.getLogger(__name__)
 
+# Validation lookup tables (built once, O(1) membership); the Bloom tables
+# are also imported by api_server for request validation
+BLOOM_LEVELS = ('Remember', 'Understand', 'Apply', 'Analyze', 'Evaluate', 'Create')
+VALID_BLOOM_LEVELS = frozenset(BLOOM_LEVELS)
+_BLOOM_LEVELS_TEXT = ', '.join(BLOOM_LEVELS)
+_ALLOWED_ANSWERS = frozenset('ABCD')
+
 
 class QuestionAPIService:
     """
@@ -80,6 +94,53 @@ class QuestionAPIService:
             return questions[index]
         return None
     
+    def get_questions_bulk(
+        self,
+        session_state,
+        indexes: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve several questions in one call.
+        
+        Args:
+            session_state: Streamlit session state object
+            indexes: Array indexes (0-based) to fetch, in order; None for all.
+                     Out-of-range indexes are skipped.
+        
+        Returns:
+            List of question dictionaries
+        """
+        questions = self.get_all_questions(session_state)
+        if indexes is None:
+            return questions
+        count = len(questions)
+        return [questions[i] for i in indexes if 0 <= i < count]
+    
+    def iter_questions(
+        self,
+        session_state,
+        indexes: Optional[List[int]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over questions without building an intermediate list.
+        
+        Args:
+            session_state: Streamlit session state object
+            indexes: Array indexes (0-based) to yield, in order; None for all.
+                     Out-of-range indexes are skipped.
+        
+        Yields:
+            Question dictionaries
+        """
+        questions = self.get_all_questions(session_state)
+        if indexes is None:
+            yield from questions
+            return
+        count = len(questions)
+        for i in indexes:
+            if 0 <= i < count:
+                yield questions[i]
+    
     def create_question(self, question_data: Dict[str, Any], session_state) -> bool:
         """
         Create a new question.
@@ -167,9 +228,11 @@ class QuestionAPIService:
                 # Remove question
                 deleted_q = questions.pop(question_index)
                 
-                # Renumber remaining questions
-                for i, q in enumerate(questions):
-                    q['question_number'] = i + 1
+                # Renumber only the questions that shifted down; earlier ones keep their numbers
+                for number, q in enumerate(
+                    islice(questions, question_index, None), start=question_index + 1
+                ):
+                    q['question_number'] = number
                 
                 session_state.generated_tqs = questions
                 
@@ -185,7 +248,12 @@ class QuestionAPIService:
         # Future: Add database delete here
         return False
     
-    def regenerate_question(self, question_index: int, api_key: str, session_state) -> bool:
+    def regenerate_question(
+        self,
+        question_index: int,
+        api_key: str,
+        session_state
+    ) -> Optional[Dict[str, Any]]:
         """
         Regenerate a question using AI.
         
@@ -195,7 +263,7 @@ class QuestionAPIService:
             session_state: Streamlit session state object
         
         Returns:
-            True if successful, False otherwise
+            The regenerated question dictionary, or None if regeneration failed
         """
         questions = self.get_all_questions(session_state)
         
@@ -203,13 +271,7 @@ class QuestionAPIService:
             old_question = questions[question_index]
             
             # Create a slot from the existing question
-            slot = {
-                "outcome_id": old_question.get("outcome_id", 0),
-                "outcome_text": old_question.get("outcome_text", old_question.get("learning_outcome", "")),
-                "bloom_level": old_question.get("bloom_level", old_question.get("bloom", "Remember")),
-                "question_type": old_question.get("question_type", old_question.get("type", "MCQ")),
-                "points": old_question.get("points", 1)
-            }
+            slot = self._slot_from_question(old_question)
             
             # Generate new question
             logger.info(f"Regenerating question at index {question_index}")
@@ -229,13 +291,103 @@ class QuestionAPIService:
                 session_state.tqs_stats = get_tqs_statistics(questions)
                 
                 logger.info(f"Successfully regenerated question {new_question['question_number']}")
-                return True
+                return new_question
             else:
                 logger.error(f"Failed to generate new question for index {question_index}")
-                return False
+                return None
         else:
             logger.error(f"Question index {question_index} out of range")
-            return False
+            return None
+    
+    def regenerate_questions(
+        self,
+        question_indexes: List[int],
+        api_key: str,
+        session_state
+    ) -> Dict[str, Any]:
+        """
+        Regenerate several questions with as few Gemini calls as possible.
+        
+        Questions sharing type, Bloom level and outcome are regenerated together
+        in one batched request (up to 8 per call), and session state is written
+        and re-scored once at the end.
+        
+        Args:
+            question_indexes: Array indexes (0-based); duplicates are ignored
+            api_key: Gemini API key
+            session_state: Streamlit session state object
+        
+        Returns:
+            Dictionary with:
+                - regenerated: List[int] indexes that were replaced
+                - failed: List[int] indexes that could not be regenerated
+                - questions: List[Dict] new questions, in regenerated order
+        """
+        questions = self.get_all_questions(session_state)
+        count = len(questions)
+        indexes = list(dict.fromkeys(question_indexes))
+        
+        failed = [i for i in indexes if not 0 <= i < count]
+        slots = []
+        for i in indexes:
+            if 0 <= i < count:
+                slot = self._slot_from_question(questions[i])
+                slot["_index"] = i
+                slots.append(slot)
+        
+        replacements = {}
+        batches = split_large_batches(group_slots_by_characteristics(slots), max_batch_size=8)
+        logger.info(f"Regenerating {len(slots)} questions in {len(batches)} batched calls")
+        
+        for _, batch_slots in batches:
+            try:
+                generated = generate_batch_questions(batch_slots, api_key)
+            except Exception as e:
+                logger.error(f"Batch regeneration failed: {str(e)}")
+                generated = []
+            
+            # Results are positional; anything short of a full batch is unusable
+            if len(generated) != len(batch_slots):
+                failed.extend(slot["_index"] for slot in batch_slots)
+                continue
+            for slot, new_question in zip(batch_slots, generated):
+                replacements[slot["_index"]] = new_question
+        
+        now = datetime.now().isoformat()
+        regenerated = []
+        for i in indexes:
+            new_question = replacements.get(i)
+            if new_question is None:
+                continue
+            old_question = questions[i]
+            new_question['question_number'] = old_question['question_number']
+            new_question['created_at'] = old_question.get('created_at', now)
+            new_question['updated_at'] = now
+            new_question['regenerated'] = True
+            questions[i] = new_question
+            regenerated.append(i)
+        
+        if regenerated:
+            session_state.generated_tqs = questions
+            session_state.tqs_stats = get_tqs_statistics(questions)
+        
+        logger.info(f"Regenerated {len(regenerated)} questions, {len(failed)} failed")
+        return {
+            'regenerated': regenerated,
+            'failed': failed,
+            'questions': [questions[i] for i in regenerated]
+        }
+    
+    @staticmethod
+    def _slot_from_question(question: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a generation slot carrying an existing question's metadata."""
+        return {
+            "outcome_id": question.get("outcome_id", 0),
+            "outcome_text": question.get("outcome_text", question.get("learning_outcome", "")),
+            "bloom_level": question.get("bloom_level", question.get("bloom", "Remember")),
+            "question_type": question.get("question_type", question.get("type", "MCQ")),
+            "points": question.get("points", 1)
+        }
     
     def bulk_update_questions(self, updates: List[Dict[str, Any]], session_state) -> Dict[str, Any]:
         """
@@ -321,15 +473,12 @@ class QuestionAPIService:
         current_question = questions[question_index]
         question_type = current_question.get('type', current_question.get('question_type', 'MCQ'))
         
-        # Validation
-        valid_bloom_levels = ['Remember', 'Understand', 'Apply', 'Analyze', 'Evaluate', 'Create']
-        
         # Validate bloom_level if provided
         if 'bloom_level' in update_data:
-            if update_data['bloom_level'] not in valid_bloom_levels:
+            if update_data['bloom_level'] not in VALID_BLOOM_LEVELS:
                 result['errors'].append(
                     f"Invalid bloom_level: {update_data['bloom_level']}. "
-                    f"Must be one of: {', '.join(valid_bloom_levels)}"
+                    f"Must be one of: {_BLOOM_LEVELS_TEXT}"
                 )
         
         # Validate points if provided
@@ -358,13 +507,13 @@ class QuestionAPIService:
             # Validate correct_answer if provided
             if 'correct_answer' in update_data:
                 answer = update_data['correct_answer']
-                if answer not in ['A', 'B', 'C', 'D']:
+                if answer not in _ALLOWED_ANSWERS:
                     result['errors'].append(
                         f"Invalid correct_answer: {answer}. Must be A, B, C, or D"
                     )
                 
                 # If choices are being updated, verify answer is valid for new choices
-                if 'choices' in update_data:
+                elif 'choices' in update_data:
                     choices = update_data['choices']
                     answer_index = ord(answer) - ord('A')
                     if answer_index >= len(choices):
@@ -48,7 +48,7 @@ Key Output Format (Normalized):
 
 import json
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union, BinaryIO
 import io
 from datetime import datetime
 import pandas as pd
@@ -112,7 +112,7 @@ class TOSFileParser:
 
     def parse(
         self,
-        file_content: bytes,
+        file_content: Union[bytes, BinaryIO],
         file_name: str,
         file_type: str = None
     ) -> Dict[str, Any]:
@@ -120,7 +120,8 @@ class TOSFileParser:
         Parse a TOS file and return normalized structure.
 
         Args:
-            file_content: Raw bytes of the file
+            file_content: Raw bytes of the file, or a seekable binary file object
+                (e.g. an upload) which is read in place instead of copied
             file_name: Original filename
             file_type: File type (json, pdf, docx). Auto-detected if not provided.
 
@@ -159,6 +160,22 @@ class TOSFileParser:
                 f"Supported: {', '.join(self.supported_formats)}"
             )
 
+    @staticmethod
+    def _as_stream(file_content: Union[bytes, BinaryIO]) -> BinaryIO:
+        """Seekable stream over the file, rewound to the start."""
+        if hasattr(file_content, "read"):
+            file_content.seek(0)
+            return file_content
+        return io.BytesIO(file_content)
+
+    @staticmethod
+    def _as_bytes(file_content: Union[bytes, BinaryIO]) -> bytes:
+        """Whole file as bytes (for formats parsed from memory, like JSON)."""
+        if hasattr(file_content, "read"):
+            file_content.seek(0)
+            return file_content.read()
+        return file_content
+
     def _detect_file_type(self, file_name: str) -> str:
         """Detect file type from filename extension"""
         if not file_name:
@@ -176,7 +193,7 @@ class TOSFileParser:
         else:
             raise TOSParsingError(f"Cannot detect file type from: {file_name}")
 
-    def _parse_json(self, file_content: bytes, file_name: str) -> Dict[str, Any]:
+    def _parse_json(self, file_content: Union[bytes, BinaryIO], file_name: str) -> Dict[str, Any]:
         """
         Parse JSON TOS file.
 
@@ -190,7 +207,7 @@ class TOSFileParser:
         }
         """
         try:
-            content_str = file_content.decode("utf-8")
+            content_str = self._as_bytes(file_content).decode("utf-8")
             data = json.loads(content_str)
         except (UnicodeDecodeError, json.JSONDecodeError) as e:
             raise TOSParsingError(f"Invalid JSON file: {str(e)}")
@@ -198,7 +215,7 @@ class TOSFileParser:
         # Validate and normalize the JSON structure
         return self._validate_and_normalize_tos(data, file_name)
 
-    def _parse_pdf(self, file_content: bytes, file_name: str) -> Dict[str, Any]:
+    def _parse_pdf(self, file_content: Union[bytes, BinaryIO], file_name: str) -> Dict[str, Any]:
         """
         Parse PDF TOS file.
 
@@ -207,7 +224,7 @@ class TOSFileParser:
         - Rows: One per outcome with item counts per Bloom level
         """
         try:
-            pdf_file = io.BytesIO(file_content)
+            pdf_file = self._as_stream(file_content)
             pdf_reader = PyPDF2.PdfReader(pdf_file)
 
             # Extract text from all pages
@@ -257,7 +274,7 @@ class TOSFileParser:
 
         return tos_data
 
-    def _parse_docx(self, file_content: bytes, file_name: str) -> Dict[str, Any]:
+    def _parse_docx(self, file_content: Union[bytes, BinaryIO], file_name: str) -> Dict[str, Any]:
         """
         Parse DOCX TOS file.
 
@@ -266,7 +283,7 @@ class TOSFileParser:
         - Data rows: One per outcome with item counts
         """
         try:
-            docx_file = io.BytesIO(file_content)
+            docx_file = self._as_stream(file_content)
             doc = Document(docx_file)
 
             if not doc.tables:
@@ -364,7 +381,7 @@ class TOSFileParser:
             }
         }
 
-    def _parse_xlsx(self, file_content: bytes, file_name: str) -> Dict[str, Any]:
+    def _parse_xlsx(self, file_content: Union[bytes, BinaryIO], file_name: str) -> Dict[str, Any]:
         """
         Parse Excel (.xlsx) TOS file.
 
@@ -378,7 +395,7 @@ class TOSFileParser:
         - Column H (optional): Total items per outcome
         """
         try:
-            excel_file = io.BytesIO(file_content)
+            excel_file = self._as_stream(file_content)
             
             # Use pandas to detect the correct sheet and work with the data
             # This will also handle merged cells better
@@ -838,13 +855,15 @@ class TOSFileParser:
 
 
 def parse_tos_file(
-    file_content: bytes,
+    file_content: Union[bytes, BinaryIO],
     file_name: str,
     file_type: str = None
 ) -> Tuple[bool, Dict[str, Any]]:
     """
     Convenience function to parse a TOS file.
 
+    file_content may be raw bytes or a seekable binary file object.
+
     Returns:
         Tuple of (success: bool, data: Dict)
         If successful: (True, normalized_tos_data)
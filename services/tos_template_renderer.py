@@ -13,7 +13,9 @@ Structure:
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
 from openpyxl.utils import get_column_letter
+from openpyxl.writer.excel import ExcelWriter
 from io import BytesIO
+from zipfile import ZipFile, ZIP_DEFLATED
 
 
 # ======================================================
@@ -30,6 +32,27 @@ METADATA_ROWS = 5   # Name, Subject Code, Title, Total Items, Total Points
 TABLE_HEADER_ROW = 7
 DATA_START_ROW = 8
 
+# Deflate level for the generated .xlsx; level 1 is several times faster than
+# zlib's default 6 and the file is only downloaded once
+XLSX_COMPRESSLEVEL = 1
+
+# Shared cell styles: built once and assigned to every cell that uses them
+THIN_BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin")
+)
+TITLE_FONT = Font(bold=True, size=12)
+LABEL_FONT = Font(bold=True, size=10)
+TOTAL_FONT = Font(bold=True, size=11)
+TABLE_HEADER_FONT = Font(bold=True, size=9)
+TABLE_HEADER_FILL = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
+TABLE_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center", wrap_text=True)
+CENTER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+LEFT_ALIGNMENT = Alignment(horizontal="left", vertical="center")
+DATA_ALIGNMENT_LEFT = Alignment(horizontal="left", vertical="top", wrap_text=True)
+
 # Column configuration (explicit widths matching reference)
 COLUMN_WIDTHS = {
     'A': 20,  # Course Content
@@ -61,19 +84,14 @@ def render_institutional_header(ws, meta):
     - Total Number of Points: From total_points (computed from question types)
     """
     
-    thin_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
+    thin_border = THIN_BORDER
     
     # ===== ROW 1: TITLE =====
     ws.merge_cells("A1:O1")
     title = ws["A1"]
     title.value = "TABLE OF SPECIFICATIONS (TOS)"
-    title.font = Font(bold=True, size=12)
-    title.alignment = Alignment(horizontal="center", vertical="center")
+    title.font = TITLE_FONT
+    title.alignment = CENTER_ALIGNMENT
     ws.row_dimensions[1].height = 20
     
     # ===== ROW 2: BLANK =====
@@ -100,14 +118,14 @@ def render_institutional_header(ws, meta):
     for label, value in left_meta:
         cell_label = ws[f"A{row}"]
         cell_label.value = label
-        cell_label.font = Font(bold=True, size=10)
+        cell_label.font = LABEL_FONT
         cell_label.border = thin_border
-        cell_label.alignment = Alignment(horizontal="left", vertical="center")
+        cell_label.alignment = LEFT_ALIGNMENT
         
         cell_value = ws[f"B{row}"]
         cell_value.value = value
         cell_value.border = thin_border
-        cell_value.alignment = Alignment(horizontal="left", vertical="center")
+        cell_value.alignment = LEFT_ALIGNMENT
         
         ws.row_dimensions[row].height = 18
         row += 1
@@ -117,14 +135,14 @@ def render_institutional_header(ws, meta):
     for label, value in right_meta:
         cell_label = ws[f"S{row}"]
         cell_label.value = label
-        cell_label.font = Font(bold=True, size=10)
+        cell_label.font = LABEL_FONT
         cell_label.border = thin_border
-        cell_label.alignment = Alignment(horizontal="left", vertical="center")
+        cell_label.alignment = LEFT_ALIGNMENT
         
         cell_value = ws[f"T{row}"]
         cell_value.value = value
         cell_value.border = thin_border
-        cell_value.alignment = Alignment(horizontal="left", vertical="center")
+        cell_value.alignment = LEFT_ALIGNMENT
         
         row += 1
 
@@ -147,16 +165,11 @@ def create_table_header_row(ws, start_row=7):
     Returns: Column mapping dict
     """
     
-    thin_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
+    thin_border = THIN_BORDER
     
-    header_font = Font(bold=True, size=9)
-    header_fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    header_font = TABLE_HEADER_FONT
+    header_fill = TABLE_HEADER_FILL
+    header_alignment = TABLE_HEADER_ALIGNMENT
     
     col_map = {}
     
@@ -274,15 +287,10 @@ def inject_data_rows(ws, col_map, outcomes, tos_matrix, start_row=9):
         start_row: Where data rows begin (default 9)
     """
     
-    thin_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
+    thin_border = THIN_BORDER
     
-    data_alignment_left = Alignment(horizontal="left", vertical="top", wrap_text=True)
-    data_alignment_center = Alignment(horizontal="center", vertical="center")
+    data_alignment_left = DATA_ALIGNMENT_LEFT
+    data_alignment_center = CENTER_ALIGNMENT
     
     # Normalize TOS matrix keys
     normalized_tos = {
@@ -436,15 +444,10 @@ def render_footer_rows(ws, col_map, totals, current_row):
     Always shown in institutional template.
     """
     
-    thin_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
+    thin_border = THIN_BORDER
     
-    header_font = Font(bold=True, size=10)
-    center_alignment = Alignment(horizontal="center", vertical="center")
+    header_font = LABEL_FONT
+    center_alignment = CENTER_ALIGNMENT
     
     # Add blank row before roundings
     current_row += 1
@@ -508,7 +511,7 @@ def render_footer_rows(ws, col_map, totals, current_row):
     
     cell = ws.cell(row=current_row, column=2)
     cell.value = "TOTAL"
-    cell.font = Font(bold=True, size=11)
+    cell.font = TOTAL_FONT
     cell.border = thin_border
     cell.alignment = center_alignment
     
@@ -525,13 +528,13 @@ def render_footer_rows(ws, col_map, totals, current_row):
         
         cell = ws.cell(row=current_row, column=col)
         cell.value = items if items > 0 else ""
-        cell.font = Font(bold=True, size=11)
+        cell.font = TOTAL_FONT
         cell.border = thin_border
         cell.alignment = center_alignment
         
         cell = ws.cell(row=current_row, column=col + 1)
         cell.value = items if items > 0 else ""
-        cell.font = Font(bold=True, size=11)
+        cell.font = TOTAL_FONT
         cell.border = thin_border
         cell.alignment = center_alignment
         
@@ -542,13 +545,13 @@ def render_footer_rows(ws, col_map, totals, current_row):
     # Grand totals
     cell = ws.cell(row=current_row, column=col_map["items_col"])
     cell.value = totals["grand_items"] if totals["grand_items"] > 0 else ""
-    cell.font = Font(bold=True, size=11)
+    cell.font = TOTAL_FONT
     cell.border = thin_border
     cell.alignment = center_alignment
     
     cell = ws.cell(row=current_row, column=col_map["points_col"])
     cell.value = totals["grand_points"] if totals["grand_points"] > 0 else ""
-    cell.font = Font(bold=True, size=11)
+    cell.font = TOTAL_FONT
     cell.border = thin_border
     cell.alignment = center_alignment
     
@@ -637,7 +640,8 @@ def export_tos_fixed_template(meta, outcomes, tos_matrix, total_items, total_poi
     
     # Step 7: Output
     output = BytesIO()
-    wb.save(output)
+    archive = ZipFile(output, "w", ZIP_DEFLATED, allowZip64=True, compresslevel=XLSX_COMPRESSLEVEL)
+    ExcelWriter(wb, archive).save()
     output.seek(0)
     
     return output
@@ -6,11 +6,14 @@ import io
 import csv
 import copy
 import random
+import threading
+from itertools import islice
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.enum.style import WD_STYLE_TYPE
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -19,9 +22,80 @@ from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 
 
+# ======================================================
+# PDF STYLES
+# ======================================================
+# Built once at import; every PDF export reuses the same style objects
+PDF_STYLES = getSampleStyleSheet()
+
+PDF_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=PDF_STYLES['Heading1'],
+    fontSize=18,
+    textColor=colors.HexColor('#1a1a1a'),
+    spaceAfter=12,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+PDF_SUBTITLE_STYLE = ParagraphStyle(
+    'CustomSubtitle',
+    parent=PDF_STYLES['Normal'],
+    fontSize=12,
+    textColor=colors.HexColor('#333333'),
+    spaceAfter=6,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+PDF_INFO_STYLE = ParagraphStyle(
+    'InfoStyle',
+    parent=PDF_STYLES['Normal'],
+    fontSize=10,
+    textColor=colors.HexColor('#666666'),
+    spaceAfter=4,
+    alignment=TA_CENTER,
+    fontName='Helvetica'
+)
+
+PDF_QUESTION_STYLE = ParagraphStyle(
+    'QuestionStyle',
+    parent=PDF_STYLES['Normal'],
+    fontSize=11,
+    textColor=colors.black,
+    spaceAfter=8,
+    alignment=TA_JUSTIFY,
+    fontName='Helvetica'
+)
+
+
 class TQSExportService:
     """Service for exporting test questions to various formats."""
     
+    # CSV column headers, in output order (fixed; a tuple so it can't be mutated)
+    CSV_FIELDNAMES = (
+        'Question Number',
+        'Question Text',
+        'Question Type',
+        'Option A',
+        'Option B',
+        'Option C',
+        'Option D',
+        'Correct Answer',
+        'Answer Key/Sample Answer',
+        'Bloom Level',
+        'Points',
+        'Learning Outcome'
+    )
+    
+    # Questions per chunk when streaming CSV
+    CSV_STREAM_BATCH = 256
+    
+    # Serialized blank DOCX with default styles (built on first export; the
+    # lock keeps concurrent threadpool exports from building it twice)
+    _docx_prototype: Optional[bytes] = None
+    _docx_prototype_lock = threading.Lock()
+    
     def __init__(self):
         self.default_course_name = "Course Name"
         self.default_exam_title = "Test Question Sheet"
@@ -94,6 +168,49 @@ class TQSExportService:
             instructor_name=instructor_name
         )
     
+    def _new_docx(self):
+        """
+        Create a blank document with the export's default styles applied.
+        
+        The styled empty document (including the question/answer paragraph
+        styles) is serialized once per process and every export opens a copy
+        of those bytes, so style setup isn't redone.
+        """
+        if TQSExportService._docx_prototype is None:
+            with TQSExportService._docx_prototype_lock:
+                if TQSExportService._docx_prototype is None:
+                    TQSExportService._docx_prototype = self._build_docx_prototype()
+        
+        return Document(io.BytesIO(TQSExportService._docx_prototype))
+    
+    @staticmethod
+    def _build_docx_prototype() -> bytes:
+        """Build and serialize the styled blank document used by _new_docx."""
+        doc = Document()
+        
+        # Set default styles
+        style = doc.styles['Normal']
+        style.font.name = 'Arial'
+        style.font.size = Pt(11)
+        
+        # Paragraph styles for the per-question blocks, so each question
+        # paragraph just references a style instead of carrying its own
+        # indent/font properties
+        for name, indent in (('TQS Question Text', 0.25), ('TQS Answer Line', 0.5)):
+            para_style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+            para_style.base_style = style
+            para_style.paragraph_format.left_indent = Inches(indent)
+        
+        meta_style = doc.styles.add_style('TQS Answer Meta', WD_STYLE_TYPE.PARAGRAPH)
+        meta_style.base_style = style
+        meta_style.paragraph_format.left_indent = Inches(0.25)
+        meta_style.font.size = Pt(9)
+        meta_style.font.color.rgb = RGBColor(128, 128, 128)
+        
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+    
     def _generate_single_docx(
         self,
         questions: List[Dict[str, Any]], 
@@ -105,12 +222,7 @@ class TQSExportService:
         version_label: str = None
     ) -> io.BytesIO:
         """Generate a single DOCX document."""
-        doc = Document()
-        
-        # Set default styles
-        style = doc.styles['Normal']
-        style.font.name = 'Arial'
-        style.font.size = Pt(11)
+        doc = self._new_docx()
         
         # Add Header with version label if provided
         title_text = exam_title or self.default_exam_title
@@ -208,12 +320,7 @@ class TQSExportService:
             shuffle_choices=True
         )
         
-        doc = Document()
-        
-        # Set default styles
-        style = doc.styles['Normal']
-        style.font.name = 'Arial'
-        style.font.size = Pt(11)
+        doc = self._new_docx()
         
         # Generate each version
         for version_idx, (version_label, version_questions) in enumerate(versions):
@@ -347,28 +454,19 @@ class TQSExportService:
         q_header_run.font.size = Pt(11)
         
         # Question text
-        q_para = doc.add_paragraph(q_text)
-        q_para.paragraph_format.left_indent = Inches(0.25)
+        doc.add_paragraph(q_text, style='TQS Question Text')
         
         # Add type-specific content
         if q_type == 'MCQ':
             choices = question.get('choices', [])
-            choice_labels = ['A', 'B', 'C', 'D']
-            for i, choice in enumerate(choices[:4]):
-                choice_para = doc.add_paragraph()
-                choice_para.paragraph_format.left_indent = Inches(0.5)
-                choice_text = f"{choice_labels[i]}. {choice}"
-                choice_para.add_run(choice_text)
+            for label, choice in zip('ABCD', choices):
+                doc.add_paragraph(f"{label}. {choice}", style='TQS Answer Line')
         
         elif q_type == 'Short Answer':
-            answer_para = doc.add_paragraph()
-            answer_para.paragraph_format.left_indent = Inches(0.5)
-            answer_para.add_run("Answer: " + "_" * 60)
+            doc.add_paragraph("Answer: " + "_" * 60, style='TQS Answer Line')
         
         elif q_type in ['Essay', 'Problem Solving']:
-            answer_para = doc.add_paragraph()
-            answer_para.paragraph_format.left_indent = Inches(0.5)
-            answer_para.add_run("Answer space:\n\n\n\n")
+            doc.add_paragraph("Answer space:\n\n\n\n", style='TQS Answer Line')
         
         doc.add_paragraph()  # Spacing between questions
     
@@ -415,11 +513,7 @@ class TQSExportService:
                 answer_para.add_run(sample_answer[:100] + "..." if len(sample_answer) > 100 else sample_answer)
             
             # Add metadata
-            meta_para = doc.add_paragraph()
-            meta_para.paragraph_format.left_indent = Inches(0.25)
-            meta_run = meta_para.add_run(f"  Bloom Level: {bloom} | Points: {points}")
-            meta_run.font.size = Pt(9)
-            meta_run.font.color.rgb = RGBColor(128, 128, 128)
+            doc.add_paragraph(f"  Bloom Level: {bloom} | Points: {points}", style='TQS Answer Meta')
             
             doc.add_paragraph()  # Spacing
     
@@ -509,49 +603,11 @@ class TQSExportService:
         # Container for PDF elements
         elements = []
         
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#333333'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        info_style = ParagraphStyle(
-            'InfoStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#666666'),
-            spaceAfter=4,
-            alignment=TA_CENTER,
-            fontName='Helvetica'
-        )
-        
-        question_style = ParagraphStyle(
-            'QuestionStyle',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.black,
-            spaceAfter=8,
-            alignment=TA_JUSTIFY,
-            fontName='Helvetica'
-        )
+        styles = PDF_STYLES
+        title_style = PDF_TITLE_STYLE
+        subtitle_style = PDF_SUBTITLE_STYLE
+        info_style = PDF_INFO_STYLE
+        question_style = PDF_QUESTION_STYLE
         
         # Add Header with version label if provided
         title_text = exam_title or self.default_exam_title
@@ -638,48 +694,11 @@ class TQSExportService:
         )
         
         elements = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#333333'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        info_style = ParagraphStyle(
-            'InfoStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#666666'),
-            spaceAfter=4,
-            alignment=TA_CENTER,
-            fontName='Helvetica'
-        )
-        
-        question_style = ParagraphStyle(
-            'QuestionStyle',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.black,
-            spaceAfter=8,
-            alignment=TA_JUSTIFY,
-            fontName='Helvetica'
-        )
+        styles = PDF_STYLES
+        title_style = PDF_TITLE_STYLE
+        subtitle_style = PDF_SUBTITLE_STYLE
+        info_style = PDF_INFO_STYLE
+        question_style = PDF_QUESTION_STYLE
         
         # Generate each version
         for version_idx, (version_label, version_questions) in enumerate(versions):
@@ -859,7 +878,8 @@ class TQSExportService:
         """
         Export questions to CSV format.
         
-        Format: Question, Option A, Option B, Option C, Option D, Correct Answer, Bloom Level, Points
+        Format: one row per question in CSV_FIELDNAMES column order, written
+        with csv.writer straight into the returned buffer (no DataFrame).
         
         Args:
             questions: List of question dictionaries
@@ -869,51 +889,73 @@ class TQSExportService:
         """
         csv_buffer = io.StringIO()
         
-        # Define CSV headers
-        fieldnames = [
-            'Question Number',
-            'Question Text',
-            'Question Type',
-            'Option A',
-            'Option B',
-            'Option C',
-            'Option D',
-            'Correct Answer',
-            'Answer Key/Sample Answer',
-            'Bloom Level',
-            'Points',
-            'Learning Outcome'
-        ]
+        writer = csv.writer(csv_buffer)
+        writer.writerow(self.CSV_FIELDNAMES)
         
-        writer = csv.DictWriter(csv_buffer, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Write questions
-        for q in questions:
-            q_type = q.get('type', q.get('question_type', 'MCQ'))
-            choices = q.get('choices', [])
-            
-            # Build row data
-            row = {
-                'Question Number': q.get('question_number', ''),
-                'Question Text': q.get('question_text', ''),
-                'Question Type': q_type,
-                'Option A': choices[0] if len(choices) > 0 else '',
-                'Option B': choices[1] if len(choices) > 1 else '',
-                'Option C': choices[2] if len(choices) > 2 else '',
-                'Option D': choices[3] if len(choices) > 3 else '',
-                'Correct Answer': q.get('correct_answer', '') if q_type == 'MCQ' else 'N/A',
-                'Answer Key/Sample Answer': q.get('answer_key', q.get('sample_answer', '')),
-                'Bloom Level': q.get('bloom_level', q.get('bloom', '')),
-                'Points': q.get('points', 1),
-                'Learning Outcome': q.get('outcome_text', q.get('learning_outcome', ''))
-            }
-            
-            writer.writerow(row)
+        # Build the table column-by-column, then emit rows in one writerows call
+        writer.writerows(zip(*self._csv_columns(questions)))
         
         csv_buffer.seek(0)
         return csv_buffer
     
+    def iter_csv(self, questions: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Stream questions as CSV text in small batches.
+        
+        Same columns as export_to_csv, but only one batch of rows is ever held
+        in memory, so it suits streaming HTTP responses for large banks.
+        
+        Args:
+            questions: Iterable of question dictionaries (may be a generator)
+            
+        Yields:
+            CSV text chunks (header first, then one chunk per batch)
+        """
+        chunk_buffer = io.StringIO()
+        writer = csv.writer(chunk_buffer)
+        
+        writer.writerow(self.CSV_FIELDNAMES)
+        yield chunk_buffer.getvalue()
+        
+        questions = iter(questions)
+        while True:
+            batch = list(islice(questions, self.CSV_STREAM_BATCH))
+            if not batch:
+                break
+            chunk_buffer.seek(0)
+            chunk_buffer.truncate(0)
+            writer.writerows(zip(*self._csv_columns(batch)))
+            yield chunk_buffer.getvalue()
+    
+    @staticmethod
+    def _csv_columns(questions: List[Dict[str, Any]]) -> List[List[Any]]:
+        """
+        Build the CSV table as one list per column (CSV_FIELDNAMES order).
+        
+        Each column is a single comprehension over the questions, so rows are
+        never materialized as dicts; zip(*columns) yields them as tuples.
+        """
+        types = [q.get('type', q.get('question_type', 'MCQ')) for q in questions]
+        choices = [q.get('choices') or () for q in questions]
+        
+        def option(i):
+            return [c[i] if len(c) > i else '' for c in choices]
+        
+        return [
+            [q.get('question_number', '') for q in questions],
+            [q.get('question_text', '') for q in questions],
+            types,
+            option(0),
+            option(1),
+            option(2),
+            option(3),
+            [q.get('correct_answer', '') if t == 'MCQ' else 'N/A' for q, t in zip(questions, types)],
+            [q.get('answer_key', q.get('sample_answer', '')) for q in questions],
+            [q.get('bloom_level', q.get('bloom', '')) for q in questions],
+            [q.get('points', 1) for q in questions],
+            [q.get('outcome_text', q.get('learning_outcome', '')) for q in questions],
+        ]
+    
     # ======================================================
     # UTILITY METHODS
     # ======================================================
@@ -943,57 +985,42 @@ class TQSExportService:
     # CHOICE SHUFFLING & VERSION GENERATION
     # ======================================================
     
-    def _shuffle_mcq_choices(self, question: Dict[str, Any], seed: int = None) -> Dict[str, Any]:
+    def _shuffle_mcq_choices(self, question: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
         """
         Shuffle MCQ choices and update correct_answer accordingly.
         
         Args:
-            question: Question dictionary (will be copied, not modified)
-            seed: Random seed for reproducible shuffling
+            question: Question dictionary (not modified; MCQs get a shallow
+                copy with a new choices list)
+            rng: Random generator shared across the whole question list
             
         Returns:
-            New question dictionary with shuffled choices
+            Question dictionary with shuffled choices
         """
-        # Create a deep copy to avoid modifying original
-        q_copy = copy.deepcopy(question)
-        
-        q_type = q_copy.get('type', q_copy.get('question_type', ''))
+        q_type = question.get('type', question.get('question_type', ''))
         
         # Only shuffle MCQ questions
         if q_type != 'MCQ':
-            return q_copy
-        
-        choices = q_copy.get('choices', [])
-        if len(choices) < 2:
-            return q_copy
+            return question
         
-        correct_answer = q_copy.get('correct_answer', 'A')
+        choices = question.get('choices', [])
+        correct_answer = question.get('correct_answer', 'A')
         choice_labels = ['A', 'B', 'C', 'D']
         
-        # Get the index of correct answer
-        if correct_answer not in choice_labels:
-            return q_copy
-        
-        correct_index = choice_labels.index(correct_answer)
-        
-        # Create list of (choice, is_correct) tuples
-        choice_pairs = [(choices[i], i == correct_index) for i in range(len(choices))]
-        
-        # Shuffle with seed if provided
-        if seed is not None:
-            random.seed(seed)
-        random.shuffle(choice_pairs)
+        if len(choices) < 2 or correct_answer not in choice_labels:
+            return question
         
-        # Update choices and find new correct answer position
-        new_choices = []
-        new_correct_index = 0
-        for i, (choice, is_correct) in enumerate(choice_pairs):
-            new_choices.append(choice)
-            if is_correct:
-                new_correct_index = i
+        # Shuffle an index permutation, then remap the answer letter through it
+        order = list(range(len(choices)))
+        rng.shuffle(order)
         
-        q_copy['choices'] = new_choices
-        q_copy['correct_answer'] = choice_labels[new_correct_index]
+        q_copy = dict(question)
+        q_copy['choices'] = [choices[i] for i in order]
+        correct_index = choice_labels.index(correct_answer)
+        if correct_index in order:
+            q_copy['correct_answer'] = choice_labels[order.index(correct_index)]
+        else:
+            q_copy['correct_answer'] = 'A'
         
         return q_copy
     
@@ -1012,15 +1039,9 @@ class TQSExportService:
         Returns:
             New list with shuffled MCQ choices
         """
-        shuffled_questions = []
-        
-        for i, q in enumerate(questions):
-            # Use different seed for each question if seed provided
-            question_seed = None if seed is None else seed + i
-            shuffled_q = self._shuffle_mcq_choices(q, question_seed)
-            shuffled_questions.append(shuffled_q)
-        
-        return shuffled_questions
+        # One generator for the whole list instead of reseeding per question
+        rng = random.Random(seed)
+        return [self._shuffle_mcq_choices(q, rng) for q in questions]
     
     def generate_exam_versions(
         self, 
@@ -1053,8 +1074,7 @@ class TQSExportService:
             
             # Shuffle question order if enabled
             if shuffle_question_order:
-                random.seed(1000 + i)  # Different seed for each version
-                random.shuffle(version_questions)
+                random.Random(1000 + i).shuffle(version_questions)  # Different seed for each version
                 
                 # Renumber questions
                 for idx, q in enumerate(version_questions):
@@ -40,10 +40,12 @@ Key Guarantees:
     ✅ All rubric totals validated to equal points
 """
 
+import hashlib
 import json
 import random
 import logging
 import os
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import jsonschema  # For schema validation
@@ -140,6 +142,13 @@ CONSTRUCTED_RESPONSE_SCHEMA = {
     }
 }
 
+# Schemas are checked once here; each Gemini response then reuses the validator
+MCQ_VALIDATOR = jsonschema.validators.validator_for(MCQ_SCHEMA)(MCQ_SCHEMA)
+SHORT_ANSWER_VALIDATOR = jsonschema.validators.validator_for(SHORT_ANSWER_SCHEMA)(SHORT_ANSWER_SCHEMA)
+CONSTRUCTED_RESPONSE_VALIDATOR = jsonschema.validators.validator_for(
+    CONSTRUCTED_RESPONSE_SCHEMA
+)(CONSTRUCTED_RESPONSE_SCHEMA)
+
 
 # =============================================================================
 # GEMINI API VALIDATION AND ERROR HANDLING
@@ -166,6 +175,56 @@ def validate_api_key() -> str:
     return api_key
 
 
+# Shared google-genai clients, one per API key (keyed on hash_api_key digests)
+_gemini_clients: Dict[str, Any] = {}
+_gemini_clients_lock = threading.Lock()
+
+
+def hash_api_key(api_key: str) -> str:
+    """Return a non-reversible digest of an API key, for use as a cache key."""
+    return hashlib.blake2b(api_key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_gemini_client(api_key: str):
+    """
+    Return the process-wide google-genai client for an API key.
+    
+    The client owns an HTTP connection pool, so reusing it keeps connections
+    alive across requests instead of paying TLS setup on every generation.
+    
+    Args:
+        api_key: Google Gemini API key
+    
+    Returns:
+        google.genai.Client
+    """
+    key_hash = hash_api_key(api_key)
+    client = _gemini_clients.get(key_hash)
+    if client is None:
+        import google.genai as genai
+        with _gemini_clients_lock:
+            client = _gemini_clients.get(key_hash)
+            if client is None:
+                client = genai.Client(api_key=api_key)
+                _gemini_clients[key_hash] = client
+    return client
+
+
+def close_gemini_clients() -> None:
+    """Close and forget all shared Gemini clients (call on shutdown)."""
+    with _gemini_clients_lock:
+        clients = list(_gemini_clients.values())
+        _gemini_clients.clear()
+    
+    for client in clients:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"Error closing Gemini client: {str(e)}")
+
+
 def configure_gemini_api(api_key: str) -> bool:
     """
     Configure Gemini API with the given API key using google-genai package.
@@ -183,8 +242,8 @@ def configure_gemini_api(api_key: str) -> bool:
         # Use the new google-genai package (google.generativeai is deprecated)
         import google.genai as genai
         
-        # Verify we can create a client (validates API key format)
-        test_client = genai.Client(api_key=api_key)
+        # Verify we can create a client (validates API key format); it is kept for reuse
+        get_gemini_client(api_key)
         logger.debug("Gemini API (google-genai) configured successfully")
         return True
     except ImportError as e:
@@ -369,8 +428,8 @@ def generate_batch_questions(
     try:
         import google.genai as genai
         
-        # Create client
-        client = genai.Client(api_key=api_key)
+        # Reuse the shared client (keeps the connection pool warm)
+        client = get_gemini_client(api_key)
         
         # =====================================================================
         # BUILD PROMPT FOR BATCH GENERATION
@@ -665,6 +724,44 @@ Return ONLY the JSON array, with NO other text."""
         raise
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+
+def find_json_object(text: str, loads=json.loads) -> Optional[Dict[str, Any]]:
+    """
+    Return the first JSON object in a Gemini response, or None.
+    
+    The whole text (minus any ```json fence) is tried first, since Gemini
+    usually returns pure JSON; otherwise each '{' is tried with
+    JSONDecoder.raw_decode, which finds the end of the object in C.
+    
+    Args:
+        text: Raw response text
+        loads: Parser for the happy path (e.g. an orjson-backed loader)
+    """
+    stripped = text.strip().strip("`").strip()
+    if stripped[:4].lower() == "json":
+        stripped = stripped[4:].lstrip()
+    try:
+        data = loads(stripped)
+        if isinstance(data, dict):
+            return data
+    except ValueError:
+        pass
+    
+    start = text.find('{')
+    while start != -1:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError:
+            pass
+        start = text.find('{', start + 1)
+    
+    return None
+
+
 def extract_json_from_response(response_text: str) -> Optional[Dict[str, Any]]:
     """
     Extract JSON from Gemini response which may contain markdown code blocks.
@@ -675,32 +772,10 @@ def extract_json_from_response(response_text: str) -> Optional[Dict[str, Any]]:
     - { ... } (plain JSON)
     - Other text with { ... } embedded
     """
-    try:
-        # Try to find JSON in code blocks first
-        import re
-        
-        # Pattern: ```json ... ``` or similar
-        code_block_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-        match = re.search(code_block_pattern, response_text, re.DOTALL)
-        if match:
-            json_str = match.group(1)
-            return json.loads(json_str)
-        
-        # Pattern: plain JSON object { ... }
-        plain_json_pattern = r'(\{.*\})'
-        match = re.search(plain_json_pattern, response_text, re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group(1))
-            except json.JSONDecodeError:
-                pass
-        
-        # Try parsing entire response as JSON
-        return json.loads(response_text)
-    
-    except Exception as e:
-        logger.warning(f"Failed to extract JSON from response: {e}")
-        return None
+    data = find_json_object(response_text)
+    if data is None:
+        logger.warning("Failed to extract JSON from response")
+    return data
 
 
 def validate_and_scale_rubric(rubric: Dict[str, Any], required_points: float) -> Dict[str, Any]:
@@ -781,8 +856,8 @@ def generate_question_with_gemini(slot: Dict[str, Any], api_key: str) -> Optiona
         # Configure Gemini
         configure_gemini_api(api_key)
         
-        # Create client (google-genai uses a different API than deprecated google.generativeai)
-        client = genai.Client(api_key=api_key)
+        # Shared client (google-genai uses a different API than deprecated google.generativeai)
+        client = get_gemini_client(api_key)
         
         # Extract slot data using correct field names
         question_type = slot.get("question_type", "MCQ")
@@ -849,7 +924,7 @@ Make the question challenging but fair."""
                 
                 # Validate against schema
                 try:
-                    jsonschema.validate(instance=json_data, schema=MCQ_SCHEMA)
+                    MCQ_VALIDATOR.validate(json_data)
                 except jsonschema.ValidationError as e:
                     logger.error(f"MCQ validation failed: {e}")
                     logger.debug(f"JSON data: {json.dumps(json_data, indent=2)[:500]}")
@@ -951,7 +1026,7 @@ If rubric not provided, return null for rubric field."""
                     return None
                 
                 try:
-                    jsonschema.validate(instance=json_data, schema=SHORT_ANSWER_SCHEMA)
+                    SHORT_ANSWER_VALIDATOR.validate(json_data)
                 except jsonschema.ValidationError as e:
                     logger.error(f"Short Answer validation failed: {e}")
                     logger.debug(f"JSON data: {json.dumps(json_data, indent=2)[:500]}")
@@ -1048,7 +1123,7 @@ Return ONLY valid JSON:
                     return None
                 
                 try:
-                    jsonschema.validate(instance=json_data, schema=CONSTRUCTED_RESPONSE_SCHEMA)
+                    CONSTRUCTED_RESPONSE_VALIDATOR.validate(json_data)
                 except jsonschema.ValidationError as e:
                     logger.error(f"Essay validation failed: {e}")
                     logger.debug(f"JSON data: {json.dumps(json_data, indent=2)[:500]}")
@@ -1142,7 +1217,7 @@ Return ONLY valid JSON:
                     return None
                 
                 try:
-                    jsonschema.validate(instance=json_data, schema=CONSTRUCTED_RESPONSE_SCHEMA)
+                    CONSTRUCTED_RESPONSE_VALIDATOR.validate(json_data)
                 except jsonschema.ValidationError as e:
                     logger.error(f"Problem Solving validation failed: {e}")
                     logger.debug(f"JSON data: {json.dumps(json_data, indent=2)[:500]}")
@@ -1236,7 +1311,7 @@ Return ONLY valid JSON:
                     return None
                 
                 try:
-                    jsonschema.validate(instance=json_data, schema=CONSTRUCTED_RESPONSE_SCHEMA)
+                    CONSTRUCTED_RESPONSE_VALIDATOR.validate(json_data)
                 except jsonschema.ValidationError as e:
                     logger.error(f"Drawing validation failed: {e}")
                     logger.debug(f"JSON data: {json.dumps(json_data, indent=2)[:500]}")
@@ -1754,29 +1829,35 @@ def get_tqs_statistics(tqs: List[Dict[str, Any]]) -> Dict[str, Any]:
         - points_by_bloom: Total points per Bloom level
     """
     
-    stats = {
-        "total_questions": len(tqs),
-        "total_points": sum(q.get("points", 0) for q in tqs),
-        "questions_by_type": {},
-        "points_by_type": {},
-        "questions_by_bloom": {},
-        "points_by_bloom": {}
-    }
+    total_points = 0
+    questions_by_type = {}
+    points_by_type = {}
+    questions_by_bloom = {}
+    points_by_bloom = {}
     
+    # Single pass with local dict references (no repeated stats[...] lookups)
     for question in tqs:
         qtype = question.get("type", "Unknown")
         bloom = question.get("bloom", "Unknown")
         points = question.get("points", 0)
+        total_points += points
         
         # By type
-        stats["questions_by_type"][qtype] = stats["questions_by_type"].get(qtype, 0) + 1
-        stats["points_by_type"][qtype] = stats["points_by_type"].get(qtype, 0) + points
+        questions_by_type[qtype] = questions_by_type.get(qtype, 0) + 1
+        points_by_type[qtype] = points_by_type.get(qtype, 0) + points
         
         # By Bloom
-        stats["questions_by_bloom"][bloom] = stats["questions_by_bloom"].get(bloom, 0) + 1
-        stats["points_by_bloom"][bloom] = stats["points_by_bloom"].get(bloom, 0) + points
+        questions_by_bloom[bloom] = questions_by_bloom.get(bloom, 0) + 1
+        points_by_bloom[bloom] = points_by_bloom.get(bloom, 0) + points
     
-    return stats
+    return {
+        "total_questions": len(tqs),
+        "total_points": total_points,
+        "questions_by_type": questions_by_type,
+        "points_by_type": points_by_type,
+        "questions_by_bloom": questions_by_bloom,
+        "points_by_bloom": points_by_bloom
+    }
 
 
 def export_tqs_to_json(tqs: List[Dict[str, Any]], filename: str = "tqs_export.json") -> str: